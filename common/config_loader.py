@@ -95,9 +95,9 @@ class ConfigLoader:
 
         conf_dict = {}
 
-        for field in self.conf_fields:
-            value = self.conf_fields[field]["value"]
-            correct_type = self.conf_fields[field]["type"]
+        for field, conf_field in self.conf_fields.items():
+            value = conf_field["value"]
+            correct_type = conf_field["type"]
 
             if isinstance(value, correct_type):
                 conf_dict[field] = value
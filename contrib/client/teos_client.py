@@ -29,6 +29,12 @@ logging.basicConfig(level=logging.INFO, format="%(message)s")
 
 logger = logging.getLogger()
 
+# A single session is shared by all the requests so the connection to the tower can be kept alive between them. The
+# client only talks to one tower, so a single pooled connection is enough
+session = requests.Session()
+session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0))
+session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0))
+
 
 def register(user_id, teos_id, teos_url):
     """
@@ -270,7 +276,7 @@ def post_request(data, endpoint):
     """
 
     try:
-        return requests.post(url=endpoint, json=data, timeout=5)
+        return session.post(url=endpoint, json=data, timeout=5)
 
     except Timeout:
         message = "Cannot connect to the Eye of Satoshi's API. Connection timeout"
@@ -407,8 +413,12 @@ def main(command, args, command_line_conf):
 
     setup_data_folder(config.get("DATA_DIR"))
 
-    # Set the teos url
-    teos_url = "{}:{}".format(config.get("API_CONNECT"), config.get("API_PORT"))
+    # Set the teos url. localhost is replaced by the loopback address so no name resolution is needed for every request
+    api_connect = config.get("API_CONNECT")
+    if api_connect in ["localhost", "http://localhost"]:
+        api_connect = api_connect.replace("localhost", "127.0.0.1")
+
+    teos_url = "{}:{}".format(api_connect, config.get("API_PORT"))
     # If an http or https prefix if found, leaves the server as is. Otherwise defaults to http.
     if not teos_url.startswith("http"):
         teos_url = "http://" + teos_url
@@ -461,7 +471,9 @@ def main(command, args, command_line_conf):
                 teos_id = load_teos_id(config.get("TEOS_PUBLIC_KEY"))
                 appointment_data = get_appointment(arg_opt, user_sk, teos_id, teos_url)
                 if appointment_data:
-                    print(appointment_data)
+                    # Written straight to stdout so the serialized appointment is not built as a string first
+                    json.dump(appointment_data, sys.stdout, indent=4)
+                    sys.stdout.write("\n")
 
         elif command == "help":
             if args:
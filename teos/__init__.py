@@ -5,12 +5,15 @@ version_info = (0, 1, 1)
 __version__ = ".".join([str(v) for v in version_info])
 
 DATA_DIR = os.path.expanduser("~/.teos/")
+# Default number of worker threads for the gRPC servers, scaled with the number of cores but bounded
+GRPC_WORKERS = min(32, (os.cpu_count() or 1) * 2)
 CONF_FILE_NAME = "teos.conf"
 DEFAULT_CONF = {
     "API_BIND": {"value": "localhost", "type": str},
     "API_PORT": {"value": 9814, "type": int},
     "RPC_BIND": {"value": "localhost", "type": str},
     "RPC_PORT": {"value": 8814, "type": int},
+    "RPC_WORKERS": {"value": GRPC_WORKERS, "type": int},
     "BTC_RPC_USER": {"value": "user", "type": str},
     "BTC_RPC_PASSWORD": {"value": "passwd", "type": str},
     "BTC_RPC_CONNECT": {"value": "127.0.0.1", "type": str},
@@ -34,5 +37,5 @@ DEFAULT_CONF = {
     "USERS_DB_PATH": {"value": "users", "type": str, "path": True},
     "INTERNAL_API_HOST": {"value": "localhost", "type": str},
     "INTERNAL_API_PORT": {"value": 50051, "type": int},
-    "INTERNAL_API_WORKERS": {"value": 10, "type": int},
+    "INTERNAL_API_WORKERS": {"value": GRPC_WORKERS, "type": int},
 }
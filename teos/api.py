@@ -14,6 +14,7 @@ from teos.protobuf.tower_services_pb2_grpc import TowerServicesStub
 from teos.protobuf.appointment_pb2 import Appointment, AddAppointmentRequest, GetAppointmentRequest
 
 from teos.logger import setup_logging, get_logger
+from teos.constants import INTERNAL_API_CHANNEL_OPTIONS
 
 
 # NOTCOVERED: not sure how to monkey patch this one. May be related to #77
@@ -89,6 +90,35 @@ def serve(internal_api_endpoint, endpoint, logging_port, min_to_self_delay, auto
         return api.app
 
 
+# NOTCOVERED
+def serve_gunicorn(internal_api_endpoint, endpoint, logging_port, min_to_self_delay):
+    """
+    Runs the API with gunicorn from the current process, using gunicorn's programmatic interface instead of its command
+    line, so the already loaded modules and config are reused. This method does not return.
+
+    The app is loaded by every gunicorn worker (after being forked), so the connection with the internal API is not
+    shared between processes.
+
+    Args:
+        internal_api_endpoint (:obj:`str`): endpoint where the internal api is running (``host:port``).
+        endpoint (:obj:`str`): endpoint where the http api will be running (``host:port``).
+        logging_port (:obj:`int`): the port where the logging server can be reached (localhost:logging_port)
+        min_to_self_delay (:obj:`str`): the minimum to_self_delay accepted by the :obj:`Inspector`.
+    """
+
+    # Only imported if gunicorn is used, since it is not available on Windows
+    from gunicorn.app.base import BaseApplication
+
+    class GunicornApp(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", endpoint)
+
+        def load(self):
+            return serve(internal_api_endpoint, endpoint, logging_port, min_to_self_delay)
+
+    GunicornApp().run()
+
+
 class API:
     """
     The :class:`API` is in charge of the interface between the user and the tower. It handles and serves user requests.
@@ -111,7 +141,7 @@ class API:
         self.app = Flask(__name__)
         self.inspector = inspector
         self.internal_api_endpoint = internal_api_endpoint
-        channel = grpc.insecure_channel(internal_api_endpoint)
+        channel = grpc.insecure_channel(internal_api_endpoint, options=INTERNAL_API_CHANNEL_OPTIONS)
         self.stub = TowerServicesStub(channel)
 
         # Adds all the routes to the functions listed above.
@@ -55,13 +55,14 @@ class AppointmentsDBM(DBManager):
 
             raise e
 
-    def load_appointments_db(self, prefix):
+    def load_appointments_db(self, prefix, exclude=None):
         """
         Loads all data from the appointments database given a prefix. Two prefixes are defined: ``WATCHER_PREFIX`` and
         ``RESPONDER_PREFIX``.
 
         Args:
             prefix (:obj:`str`): the prefix of the data to load.
+            exclude (:obj:`set`): the uuids of the entries to leave out, if any. Excluded entries are not decoded.
 
         Returns:
             :obj:`dict`: A dictionary containing the requested data (appointments or trackers) indexed by ``uuid``.
@@ -70,11 +71,14 @@ class AppointmentsDBM(DBManager):
         """
 
         data = {}
+        exclude = exclude or set()
 
-        for k, v in self.db.iterator(prefix=prefix.encode("utf-8")):
+        # This is a one-off full scan, so the read blocks are not kept in the cache
+        for k, v in self.db.iterator(prefix=prefix.encode("utf-8"), fill_cache=False):
             # Get uuid and appointment_data from the db
             uuid = k[len(prefix) :].decode("utf-8")  # noqa: E203
-            data[uuid] = json.loads(v)
+            if uuid not in exclude:
+                data[uuid] = json.loads(v)
 
         return data
 
@@ -142,6 +146,59 @@ class AppointmentsDBM(DBManager):
 
         return data
 
+    def batch_load_entries(self, uuids, prefix):
+        """
+        Loads multiple entries from the database, given their ``uuids`` and ``prefix``. All the entries are read from
+        the same snapshot of the database.
+
+        Args:
+            uuids (:obj:`list`): a list of 16-byte hex-encoded strings identifying the entries to be loaded.
+            prefix (:obj:`str`): the prefix of the entries (e.g. ``WATCHER_PREFIX`` or ``RESPONDER_PREFIX``).
+
+        Returns:
+            :obj:`dict`: A dictionary containing the data of each requested entry (indexed by uuid). The data of an
+            entry is :obj:`None` if it cannot be found.
+        """
+
+        data = {}
+
+        with self.db.snapshot() as snapshot:
+            for uuid in uuids:
+                try:
+                    data[uuid] = json.loads(snapshot.get((prefix + uuid).encode("utf-8")))
+                except (TypeError, json.decoder.JSONDecodeError):
+                    data[uuid] = None
+
+        return data
+
+    def batch_load_watcher_appointments(self, uuids):
+        """
+        Loads multiple appointments from the database using ``WATCHER_PREFIX`` as prefix to the given ``uuids``.
+
+        Args:
+            uuids (:obj:`list`): a list of 16-byte hex-encoded strings identifying the appointments to be loaded.
+
+        Returns:
+            :obj:`dict`: A dictionary containing the data of each requested appointment (indexed by uuid). The data of
+            an appointment is :obj:`None` if it cannot be found.
+        """
+
+        return self.batch_load_entries(uuids, WATCHER_PREFIX)
+
+    def batch_load_responder_trackers(self, uuids):
+        """
+        Loads multiple trackers from the database using ``RESPONDER_PREFIX`` as prefix to the given ``uuids``.
+
+        Args:
+            uuids (:obj:`list`): a list of 16-byte hex-encoded strings identifying the trackers to be loaded.
+
+        Returns:
+            :obj:`dict`: A dictionary containing the data of each requested tracker (indexed by uuid). The data of a
+            tracker is :obj:`None` if it cannot be found.
+        """
+
+        return self.batch_load_entries(uuids, RESPONDER_PREFIX)
+
     def load_watcher_appointments(self, include_triggered=False):
         """
         Loads all the appointments from the database (all entries with the ``WATCHER_PREFIX`` prefix).
@@ -155,14 +212,10 @@ class AppointmentsDBM(DBManager):
             are none.
         """
 
-        appointments = self.load_appointments_db(prefix=WATCHER_PREFIX)
-        triggered_appointments = self.load_all_triggered_flags()
-
-        if not include_triggered:
-            not_triggered = list(set(appointments.keys()).difference(triggered_appointments))
-            appointments = {uuid: appointments[uuid] for uuid in not_triggered}
+        # Triggered appointments are skipped while scanning, so they are not even decoded
+        exclude = None if include_triggered else set(self.load_all_triggered_flags())
 
-        return appointments
+        return self.load_appointments_db(prefix=WATCHER_PREFIX, exclude=exclude)
 
     def load_responder_trackers(self):
         """
@@ -476,7 +529,7 @@ class AppointmentsDBM(DBManager):
 
         return [
             k.decode()[len(TRIGGERED_APPOINTMENTS_PREFIX) :]  # noqa: E203
-            for k, v in self.db.iterator(prefix=TRIGGERED_APPOINTMENTS_PREFIX.encode("utf-8"))
+            for k in self.db.iterator(prefix=TRIGGERED_APPOINTMENTS_PREFIX.encode("utf-8"), include_value=False)
         ]
 
     def delete_triggered_appointment_flag(self, uuid):
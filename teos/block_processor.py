@@ -1,8 +1,13 @@
+from threading import local
+from http.client import HTTPException
+
 from teos.logger import get_logger
 from common.exceptions import BasicException
 
-from teos.tools import bitcoin_cli
-from teos.utils.auth_proxy import JSONRPCException
+from teos.tools import bitcoin_cli, ThreadLocalBitcoinCli
+from teos.utils.auth_proxy import JSONRPCException, HTTP_TIMEOUT
+
+MAX_RPC_BATCH_SIZE = 500  # Max number of calls sent to bitcoind in a single batch request
 
 
 class InvalidTransactionFormat(BasicException):
@@ -20,11 +25,16 @@ class BlockProcessor:
 
     Attributes:
         logger (:obj:`Logger <teos.logger.Logger>`): the logger for this component.
+        rpc (:obj:`ThreadLocalBitcoinCli <teos.tools.ThreadLocalBitcoinCli>`): the connection with ``bitcoind``, kept
+            alive across calls (one per thread).
     """
 
     def __init__(self, btc_connect_params):
         self.logger = get_logger(component=BlockProcessor.__name__)
         self.btc_connect_params = btc_connect_params
+        self.rpc = ThreadLocalBitcoinCli(btc_connect_params)
+        # Long polls need a longer connection timeout, so they are sent over their own connection (one per thread)
+        self._long_poll_rpc = local()
 
     def get_block(self, block_hash):
         """
@@ -40,7 +50,7 @@ class BlockProcessor:
         """
 
         try:
-            block = bitcoin_cli(self.btc_connect_params).getblock(block_hash)
+            block = self.rpc.getblock(block_hash)
 
         except JSONRPCException as e:
             block = None
@@ -59,7 +69,7 @@ class BlockProcessor:
         """
 
         try:
-            block_hash = bitcoin_cli(self.btc_connect_params).getbestblockhash()
+            block_hash = self.rpc.getbestblockhash()
 
         except JSONRPCException as e:
             block_hash = None
@@ -78,7 +88,7 @@ class BlockProcessor:
         """
 
         try:
-            block_count = bitcoin_cli(self.btc_connect_params).getblockcount()
+            block_count = self.rpc.getblockcount()
 
         except JSONRPCException as e:
             block_count = None
@@ -86,6 +96,46 @@ class BlockProcessor:
 
         return block_count
 
+    def wait_for_new_block(self, timeout):
+        """
+        Waits for a new best chain tip by long polling ``bitcoind`` (``waitfornewblock``). The call returns as soon as
+        the tip changes or once ``timeout`` has elapsed, whichever happens first.
+
+        Args:
+            timeout (:obj:`float`): the maximum time to wait for a new block (in seconds).
+
+        Returns:
+            :obj:`dict` or :obj:`None`: A dictionary containing the ``hash`` and ``height`` of the current best chain
+            tip (that is, the previous one if the call timed out).
+
+            Returns :obj:`None` if ``bitcoind`` cannot be queried or reached.
+        """
+
+        # waitfornewblock takes the timeout in milliseconds, and 0 means waiting forever
+        timeout_ms = max(int(timeout * 1000), 1)
+
+        # The connection timeout must outlast the long poll, otherwise the connection would be dropped while waiting.
+        # The connection is reused by the following polls, and only replaced if a longer poll is requested
+        connection_timeout = timeout + HTTP_TIMEOUT
+        rpc = getattr(self._long_poll_rpc, "proxy", None)
+        if rpc is None or rpc.timeout < connection_timeout:
+            rpc = bitcoin_cli(self.btc_connect_params, timeout=connection_timeout)
+            self._long_poll_rpc.proxy = rpc
+
+        try:
+            tip = rpc.waitfornewblock(timeout_ms)
+
+        except JSONRPCException as e:
+            tip = None
+            self.logger.error("Couldn't wait for a new block", error=e.error)
+
+        # Connection errors (e.g. bitcoind is down or the connection timed out) are not JSON-RPC errors
+        except (OSError, HTTPException) as e:
+            tip = None
+            self.logger.error("Couldn't reach bitcoind while waiting for a new block", error=repr(e))
+
+        return tip
+
     def decode_raw_transaction(self, raw_tx):
         """
         Deserializes a given raw transaction (hex encoded) and builds a dictionary representing it with all the
@@ -102,7 +152,7 @@ class BlockProcessor:
         """
 
         try:
-            tx = bitcoin_cli(self.btc_connect_params).decoderawtransaction(raw_tx)
+            tx = self.rpc.decoderawtransaction(raw_tx)
 
         except JSONRPCException as e:
             msg = "Cannot build transaction from decoded data"
@@ -153,6 +203,17 @@ class BlockProcessor:
             child of ``last_know_block_hash``.
         """
 
+        last_known_block = self.get_block(last_know_block_hash)
+        block_count = self.get_block_count()
+
+        # If the last known block is in the best chain, the missed blocks can be fetched by height, in batches
+        if last_known_block is not None and block_count is not None and last_known_block.get("confirmations") != -1:
+            missed_blocks = self.get_block_hashes(range(last_known_block.get("height") + 1, block_count + 1))
+
+            if missed_blocks is not None:
+                return missed_blocks
+
+        # Otherwise, walk the chain back from the tip one block at a time
         current_block_hash = self.get_best_block_hash()
         missed_blocks = []
 
@@ -164,6 +225,44 @@ class BlockProcessor:
 
         return missed_blocks[::-1]
 
+    def get_block_hashes(self, heights):
+        """
+        Gets the hashes of the best chain blocks at the given heights. The requests are sent to ``bitcoind`` in batches
+        of up to ``MAX_RPC_BATCH_SIZE`` calls.
+
+        Args:
+            heights (:obj:`range`): the heights of the requested blocks.
+
+        Returns:
+            :obj:`list` or :obj:`None`: A list with the hashes of the requested blocks, in the same order as
+            ``heights``.
+
+            Returns :obj:`None` if any of the hashes cannot be fetched.
+        """
+
+        block_hashes = []
+
+        try:
+            for i in range(0, len(heights), MAX_RPC_BATCH_SIZE):
+                batch_heights = heights[i : i + MAX_RPC_BATCH_SIZE]  # noqa: E203
+                requests = [self.rpc.getblockhash.get_request(height) for height in batch_heights]
+                # Responses are matched by id since the JSON-RPC spec does not guarantee them to be in order
+                responses = {response.get("id"): response for response in self.rpc.batch(requests)}
+
+                for request in requests:
+                    response = responses.get(request.get("id"))
+                    if response is None or response.get("error") is not None:
+                        self.logger.error("Couldn't get block hash", height=request.get("params")[0])
+                        return None
+
+                    block_hashes.append(response.get("result"))
+
+        except JSONRPCException as e:
+            self.logger.error("Couldn't get block hashes", error=e.error)
+            return None
+
+        return block_hashes
+
     def is_block_in_best_chain(self, block_hash):
         """
         Checks whether a given block is on the best chain or not. Blocks are identified by block_hash.
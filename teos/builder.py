@@ -32,12 +32,7 @@ class Builder:
         for uuid, data in appointments_data.items():
             ext_appointment = ExtendedAppointment.from_dict(data)
             appointments[uuid] = ext_appointment.get_summary()
-
-            if ext_appointment.locator in locator_uuid_map:
-                locator_uuid_map[ext_appointment.locator].append(uuid)
-
-            else:
-                locator_uuid_map[ext_appointment.locator] = [uuid]
+            locator_uuid_map.setdefault(ext_appointment.locator, []).append(uuid)
 
         return appointments, locator_uuid_map
 
@@ -67,12 +62,7 @@ class Builder:
         for uuid, data in tracker_data.items():
             tracker = TransactionTracker.from_dict(data)
             trackers[uuid] = tracker.get_summary()
-
-            if tracker.penalty_txid in tx_tracker_map:
-                tx_tracker_map[tracker.penalty_txid].append(uuid)
-
-            else:
-                tx_tracker_map[tracker.penalty_txid] = [uuid]
+            tx_tracker_map.setdefault(tracker.penalty_txid, []).append(uuid)
 
         return trackers, tx_tracker_map
 
@@ -117,18 +107,16 @@ class Builder:
             )
 
         # If the missed blocks of the Watcher and the Responder are not the same, we need to bring one up to date with
-        # the other.
+        # the other. The diff is computed in a single pass, keeping the order of the blocks.
         if len(missed_blocks_responder) > len(missed_blocks_watcher):
-            block_diff = sorted(
-                set(missed_blocks_responder).difference(missed_blocks_watcher), key=missed_blocks_responder.index
-            )
+            watcher_blocks = set(missed_blocks_watcher)
+            block_diff = [block for block in missed_blocks_responder if block not in watcher_blocks]
             Builder.populate_block_queue(watcher.responder.block_queue, block_diff)
             watcher.responder.block_queue.join()
 
         elif len(missed_blocks_watcher) > len(missed_blocks_responder):
-            block_diff = sorted(
-                set(missed_blocks_watcher).difference(missed_blocks_responder), key=missed_blocks_watcher.index
-            )
+            responder_blocks = set(missed_blocks_responder)
+            block_diff = [block for block in missed_blocks_watcher if block not in responder_blocks]
             Builder.populate_block_queue(watcher.block_queue, block_diff)
             watcher.block_queue.join()
 
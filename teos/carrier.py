@@ -1,5 +1,5 @@
 from teos.logger import get_logger
-from teos.tools import bitcoin_cli
+from teos.tools import ThreadLocalBitcoinCli
 import teos.utils.rpc_errors as rpc_errors
 from teos.utils.auth_proxy import JSONRPCException
 from common.errors import UNKNOWN_JSON_RPC_EXCEPTION, RPC_TX_REORGED_AFTER_BROADCAST
@@ -51,6 +51,7 @@ class Carrier:
         self.logger = get_logger(component=Carrier.__name__)
         self.btc_connect_params = btc_connect_params
         self.issued_receipts = {}
+        self.rpc = ThreadLocalBitcoinCli(btc_connect_params)
 
     # NOTCOVERED
     def send_transaction(self, rawtx, txid):
@@ -73,7 +74,7 @@ class Carrier:
 
         try:
             self.logger.info("Pushing transaction to the network", txid=txid, rawtx=rawtx)
-            bitcoin_cli(self.btc_connect_params).sendrawtransaction(rawtx)
+            self.rpc.sendrawtransaction(rawtx)
 
             receipt = Receipt(delivered=True)
 
@@ -138,7 +139,7 @@ class Carrier:
         """
 
         try:
-            tx_info = bitcoin_cli(self.btc_connect_params).getrawtransaction(txid, 1)
+            tx_info = self.rpc.getrawtransaction(txid, 1)
             return tx_info
 
         except JSONRPCException as e:
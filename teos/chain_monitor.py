@@ -1,7 +1,7 @@
 from enum import Enum
-from queue import Queue
 import zmq
-from threading import Thread, Event, Condition
+from collections import deque
+from threading import Thread, Event, Lock
 
 from teos.logger import get_logger
 
@@ -19,21 +19,21 @@ class ChainMonitor:
     of the best chain. If a new best block is spotted, the chain monitor will notify the given queues.
 
     The :obj:`ChainMonitor` monitors the chain using two methods: ``zmq`` and ``polling``. Blocks are only notified
-    once per queue and the notification is triggered by the method that detects the block faster.
+    once per queue and the notification is triggered by the method that detects the block faster. On top of that, the
+    block count is checked every ``liveness_interval`` seconds as a last resort in case both methods miss a block.
 
     The :obj:`ChainMonitor` lifecycle goes through 4 states: idle, listening, active and terminated.
     When a :obj:`ChainMonitor` instance is created, it is not yet monitoring the chain and the ``status`` attribute
     is set to ``ChainMonitorStatus.IDLE``.
     Once the ``monitor_chain`` method is called, the chain monitor changes ``status`` to
     ``ChainMonitorStatus.LISTENING``, and starts monitoring the chain for new blocks; it does not yet notify the
-    receiving queues, but keeps the block hashes in the order they where spotted in an internal queue.
+    receiving queues, but keeps the block hashes in the order they where spotted in ``pending_blocks``.
     Once the ``activate`` method is called, the ``status`` changes to ``ChainMonitorStatus.ACTIVE``, and the receiving
-    queues are notified in order for all the block hashes that are in the internal queue or any new one that is
-    detected.
+    queues are notified in order for all the block hashes that are in ``pending_blocks`` and, from then on, for any new
+    one as soon as it is detected.
     Finally, once the ``terminate`` method is called, the ``status`` is changed to ``ChainMonitorStatus.TERMINATED``,
     the chain monitor stops monitoring the chain and no receiving queue will be notified about new blocks (including
-    any block that is currently in the internal queue). A final ``ChainMonitor.END_MESSAGE`` is sent to all the
-    subscribers.
+    any block that is still pending). A final ``ChainMonitor.END_MESSAGE`` is sent to all the subscribers.
 
     Args:
         receiving_queues (:obj:`list`): a list of :obj:`Queue` objects that will be notified when the chain_monitor is
@@ -43,13 +43,28 @@ class ChainMonitor:
 
     Attributes:
         logger (:obj:`Logger <teos.logger.Logger>`): The logger for this component.
-        last_tips (:obj:`list`): A list of last chain tips. Used as a sliding window to avoid notifying about old tips.
-        check_tip (:obj:`Event`): An event that is triggered at fixed time intervals and controls the polling thread.
-        lock (:obj:`Condition`): A lock used to protect concurrent access to the queues by the zmq and polling threads.
+        last_tips (:obj:`deque`): A bounded queue of last chain tips. Used as a sliding window to avoid notifying about
+            old tips.
+        check_tip (:obj:`Event`): An event used by the polling and liveness threads to wait between checks.
+        lock (:obj:`Lock`): A lock used to protect concurrent access to the internal state and the queues by the
+            zmq and polling threads.
+        zmqContext (:obj:`Context`): The zmq context of the sockets below. The context, the sockets and the poller are
+            created once the zmq thread is started (:obj:`None` beforehand).
         zmqSubSocket (:obj:`socket`): A socket to connect to ``bitcoind`` via ``zmq``.
-        polling_delta (:obj:`int`): Time between polls (in seconds).
+        zmqInterruptRecvSocket (:obj:`socket`): An inproc socket polled alongside ``zmqSubSocket`` to be able to
+            interrupt the zmq thread.
+        zmqInterruptSendSocket (:obj:`socket`): The counterpart of ``zmqInterruptRecvSocket``, used to interrupt the zmq
+            thread.
+        zmqPoller (:obj:`Poller`): The poller used to wait on both ``zmqSubSocket`` and ``zmqInterruptRecvSocket``.
+        zmq_poll_timeout (:obj:`int`): Max time the zmq thread waits for a message before checking the status again
+            (in milliseconds).
+        polling_delta (:obj:`int`): Time to wait before polling again if ``bitcoind`` cannot be reached (in seconds).
+        long_poll_timeout (:obj:`int`): Max time a poll waits for a new block before checking the status again (in
+            seconds). Kept below ``bitcoind``'s ``rpcservertimeout`` (30 seconds by default).
+        liveness_interval (:obj:`int`): Time between liveness checks (in seconds).
         max_block_window_size (:obj:`int`): Max size of ``last_tips``.
-        queue (:obj:`Queue`): A queue where blocks are stored before they are processed.
+        pending_blocks (:obj:`list`): The block hashes received before the :obj:`ChainMonitor` is activated, in the
+            order they were received.
         status (:obj:`ChainMonitorStatus`): The current status of the monitor, either ``ChainMonitorStatus.IDLE``,
             ``ChainMonitorStatus.LISTENING``, ``ChainMonitorStatus.ACTIVE`` or ``ChainMonitorStatus.TERMINATED``.
     """
@@ -58,36 +73,44 @@ class ChainMonitor:
 
     def __init__(self, receiving_queues, block_processor, bitcoind_feed_params):
         self.logger = get_logger(component=ChainMonitor.__name__)
-        self.last_tips = []
 
         self.check_tip = Event()
-        self.lock = Condition()
-
-        self.zmqContext = zmq.Context()
-        self.zmqSubSocket = self.zmqContext.socket(zmq.SUB)
-        self.zmqSubSocket.setsockopt(zmq.RCVHWM, 0)
-        self.zmqSubSocket.setsockopt_string(zmq.SUBSCRIBE, "hashblock")
-        self.zmqSubSocket.connect(
-            "%s://%s:%s"
-            % (
-                bitcoind_feed_params.get("BTC_FEED_PROTOCOL"),
-                bitcoind_feed_params.get("BTC_FEED_CONNECT"),
-                bitcoind_feed_params.get("BTC_FEED_PORT"),
-            )
-        )
+        self.lock = Lock()
+
+        # The zmq context and sockets are only created once the zmq thread is started (see _ensure_zmq), so instances
+        # that never monitor the chain via zmq (e.g. in tests) do not pay for them
+        self.bitcoind_feed_params = bitcoind_feed_params
+        self.zmqContext = None
+        self.zmqSubSocket = None
+        self.zmqInterruptRecvSocket = None
+        self.zmqInterruptSendSocket = None
+        self.zmqPoller = None
+        self.zmq_poll_timeout = 500
 
         self.receiving_queues = receiving_queues
+        # The put methods of the receiving queues are bound once so notifying does not look them up on every block
+        self._put_fns = tuple(rec_queue.put for rec_queue in receiving_queues)
 
         self.polling_delta = 60
+        self.long_poll_timeout = 25
+        self.liveness_interval = 15 * 60
         self.max_block_window_size = 10
+        self.last_tips = deque(maxlen=self.max_block_window_size)
+        # Mirrors last_tips so membership can be checked in constant time
+        self._last_tips_set = set()
         self.block_processor = block_processor
-        self.queue = Queue()
+        self.pending_blocks = []
         self.status = ChainMonitorStatus.IDLE
+        # Checked by the monitoring loops instead of status, since a bool check is cheaper than comparing enum members
+        self._terminated = False
 
     def enqueue(self, block_hash):
         """
-        Adds a new block hash to the internal queue of the  :obj:`ChainMonitor` and the internal state. The state contains
-        the list of ``last_tips`` to prevent notifying about old blocks. ``last_tips`` is bounded to
+        Adds a new block hash to the internal state of the :obj:`ChainMonitor` and notifies the receiving queues about
+        it if the :obj:`ChainMonitor` is active. If it is not active yet, the block hash is added to ``pending_blocks``
+        instead. Blocks received once the :obj:`ChainMonitor` has been terminated are not notified.
+
+        The state contains the list of ``last_tips`` to prevent notifying about old blocks. ``last_tips`` is bounded to
         ``max_block_window_size``.
 
         Args:
@@ -97,74 +120,169 @@ class ChainMonitor:
             :obj:`bool`: True if the state was successfully updated, False otherwise.
         """
 
-        if block_hash not in self.last_tips:
-            with self.lock:
-                self.queue.put(block_hash)
-                self.last_tips.append(block_hash)
+        # The check is done while holding the lock so the zmq and polling threads cannot both add the same block
+        with self.lock:
+            return self._enqueue(block_hash)
 
-                if len(self.last_tips) > self.max_block_window_size:
-                    self.last_tips.pop(0)
+    def _enqueue(self, block_hash):
+        """
+        Same as ``enqueue``, but ``lock`` must be held by the caller. This allows enqueuing several block hashes under
+        a single acquisition of the lock.
 
-            return True
+        Args:
+            block_hash (:obj:`str`): the new best tip.
+
+        Returns:
+            :obj:`bool`: True if the state was successfully updated, False otherwise.
+        """
 
-        else:
+        if block_hash in self._last_tips_set:
             return False
 
+        self._add_tip(block_hash)
+
+        if self.status == ChainMonitorStatus.ACTIVE:
+            self.notify_subscribers(block_hash)
+        elif self.status != ChainMonitorStatus.TERMINATED:
+            self.pending_blocks.append(block_hash)
+
+        return True
+
+    def _add_tip(self, block_hash):
+        """
+        Appends a block hash to ``last_tips``, evicting the oldest one if the window is full.
+
+        Args:
+            block_hash (:obj:`str`): the new best tip.
+        """
+
+        if len(self.last_tips) == self.max_block_window_size:
+            self._last_tips_set.discard(self.last_tips.popleft())
+
+        self.last_tips.append(block_hash)
+        self._last_tips_set.add(block_hash)
+
     def monitor_chain_polling(self):
         """
         Monitors ``bitcoind`` via polling. Once the method is fired, it keeps monitoring as long as the ``status``
-        attribute is not ``ChainMonitorStatus.TERMINATED``. Polling is performed once every ``polling_delta`` seconds.
-        If a new best tip is found, it is added to the internal queue.
+        attribute is not ``ChainMonitorStatus.TERMINATED``. Polling is performed by long polling ``bitcoind``, so each
+        request returns as soon as a new block is found or after ``long_poll_timeout`` seconds if there is none. The
+        status is checked between polls. If a new best tip is found, it is enqueued.
         """
 
-        while self.status != ChainMonitorStatus.TERMINATED:
-            self.check_tip.wait(timeout=self.polling_delta)
+        while not self._terminated:
+            current_tip = self.block_processor.wait_for_new_block(self.long_poll_timeout)
+
+            # wait_for_new_block returns None if bitcoind cannot be reached. Back off before retrying in that case.
+            if current_tip is None:
+                self.check_tip.wait(timeout=self.polling_delta)
 
-            current_tip = self.block_processor.get_best_block_hash()
+            elif self.enqueue(current_tip.get("hash")):
+                self.logger.info("New block received via polling", block_hash=current_tip.get("hash"))
 
-            # get_best_block_hash may return None if the RPC times out.
-            if current_tip and current_tip not in self.last_tips:
-                self.logger.info("New block received via polling", block_hash=current_tip)
-                self.enqueue(current_tip)
+    def monitor_chain_liveness(self):
+        """
+        Checks the block count of ``bitcoind`` every ``liveness_interval`` seconds as long as the ``status`` attribute
+        is not ``ChainMonitorStatus.TERMINATED``. If the chain is higher than the last known tip, the best tip is
+        enqueued.
+
+        This covers the (unlikely) case where a block is missed by both the zmq and the polling threads.
+        """
+
+        while not self._terminated:
+            self.check_tip.wait(timeout=self.liveness_interval)
+
+            block_count = self.block_processor.get_block_count()
+            last_tip = self.block_processor.get_block(self.last_tips[-1]) if self.last_tips else None
+
+            # Both calls may return None if bitcoind cannot be reached
+            if block_count is not None and last_tip is not None and block_count > last_tip.get("height"):
+                best_block_hash = self.block_processor.get_best_block_hash()
+
+                if best_block_hash and self.enqueue(best_block_hash):
+                    self.logger.info("New block received via liveness check", block_hash=best_block_hash)
+
+    def _ensure_zmq(self):
+        """
+        Creates the zmq context, the sockets and the poller used by ``monitor_chain_zmq``, unless they already exist.
+        """
+
+        if self.zmqContext is not None:
+            return
+
+        self.zmqContext = zmq.Context()
+        self.zmqSubSocket = self.zmqContext.socket(zmq.SUB)
+        self.zmqSubSocket.setsockopt(zmq.RCVHWM, 0)
+        self.zmqSubSocket.setsockopt_string(zmq.SUBSCRIBE, "hashblock")
+        self.zmqSubSocket.connect(
+            f"{self.bitcoind_feed_params.get('BTC_FEED_PROTOCOL')}://"
+            f"{self.bitcoind_feed_params.get('BTC_FEED_CONNECT')}:{self.bitcoind_feed_params.get('BTC_FEED_PORT')}"
+        )
+
+        # A pair of connected inproc sockets used to interrupt the zmq thread while it is polling (e.g. on terminate)
+        interrupt_endpoint = f"inproc://chain_monitor_interrupt_{id(self)}"
+        self.zmqInterruptRecvSocket = self.zmqContext.socket(zmq.PAIR)
+        self.zmqInterruptRecvSocket.bind(interrupt_endpoint)
+        interrupt_send_socket = self.zmqContext.socket(zmq.PAIR)
+        interrupt_send_socket.connect(interrupt_endpoint)
+
+        self.zmqPoller = zmq.Poller()
+        self.zmqPoller.register(self.zmqSubSocket, zmq.POLLIN)
+        self.zmqPoller.register(self.zmqInterruptRecvSocket, zmq.POLLIN)
+
+        # Set last, since terminate only interrupts the thread once this socket is available
+        self.zmqInterruptSendSocket = interrupt_send_socket
 
     def monitor_chain_zmq(self):
         """
         Monitors ``bitcoind`` via zmq. Once the method is fired, it keeps monitoring as long as the ``status``
-        attribute is not ``ChainMonitorStatus.TERMINATED``. If a new best tip is found, it is added to the internal
-        queue.
+        attribute is not ``ChainMonitorStatus.TERMINATED``. The socket is polled every ``zmq_poll_timeout``
+        milliseconds, so the status is checked regularly even if no message is received. Once the socket is ready, all
+        the queued messages are drained at once (e.g. bursts on reorgs or reconnections) and every new best tip is
+        enqueued.
         """
 
-        while self.status != ChainMonitorStatus.TERMINATED:
-            msg = self.zmqSubSocket.recv_multipart()
+        self._ensure_zmq()
+
+        while not self._terminated:
+            sockets = dict(self.zmqPoller.poll(self.zmq_poll_timeout))
+
+            # Nothing to read (timeout or interrupted). The status is re-checked before polling again
+            if self.zmqSubSocket not in sockets:
+                continue
 
-            topic = msg[0]
-            body = msg[1]
+            # Messages are [topic, body, seq]. The socket is only subscribed to hashblock, so there is no need to check
+            # the topic
+            block_hashes = []
+            while True:
+                try:
+                    block_hashes.append(self.zmqSubSocket.recv_multipart(zmq.NOBLOCK)[1].hex())
+                except zmq.Again:
+                    break
 
-            if topic == b"hashblock":
-                block_hash = body.hex()
-                if block_hash not in self.last_tips:
-                    self.logger.info("New block received via zmq", block_hash=block_hash)
-                    self.enqueue(block_hash)
+            with self.lock:
+                new_block_hashes = [block_hash for block_hash in block_hashes if self._enqueue(block_hash)]
+
+            for block_hash in new_block_hashes:
+                self.logger.info("New block received via zmq", block_hash=block_hash)
 
-    def notify_subscribers(self):
+    def notify_subscribers(self, message):
         """
-        Once the method is fired, it keeps getting the elements added to the internal queue and notifies the receiving
-        queues about them. It terminates whenever the internal state is set to ``ChainMonitorStatus.TERMINATED``.
+        Notifies the receiving queues about a new message. ``lock`` must be held by the caller.
+
+        Args:
+            message (:obj:`str`): the message to be sent, either a block hash or ``ChainMonitor.END_MESSAGE``.
         """
 
-        while self.status != ChainMonitorStatus.TERMINATED:
-            message = self.queue.get()
-            # A special ChainMonitor.END_MESSAGE is added to the queue after the status is set to TERMINATED
-            # In all the other cases, message is a block_hash
-            with self.lock:
-                for rec_queue in self.receiving_queues:
-                    rec_queue.put(message)
+        for put in self._put_fns:
+            put(message)
 
     def monitor_chain(self):
         """
-        Changes the ``status`` of the :obj:`ChainMonitor` from idle to listening. It initializes the ``last_tips`` list
+        Changes the ``status`` of the :obj:`ChainMonitor` from idle to listening. It initializes the ``last_tips`` queue
         to terminate the current best tip (by querying the :obj:`BlockProcessor <teos.block_processor.BlockProcessor>`)
-        and creates two threads, one per each monitoring approach (``zmq`` and ``polling``).
+        and creates three threads, one per each monitoring approach (``zmq`` and ``polling``) and one for the liveness
+        checks.
 
         Raises:
             :obj:`RuntimeError`: if the ``status`` was not ``ChainMonitorStatus.IDLE`` when the method was called.
@@ -175,15 +293,16 @@ class ChainMonitor:
 
         self.status = ChainMonitorStatus.LISTENING
 
-        self.last_tips.append(self.block_processor.get_best_block_hash())
+        self._add_tip(self.block_processor.get_best_block_hash())
         Thread(target=self.monitor_chain_polling, daemon=True).start()
         Thread(target=self.monitor_chain_zmq, daemon=True).start()
+        Thread(target=self.monitor_chain_liveness, daemon=True).start()
 
     def activate(self):
         """
-        Changes the ``status`` of the :obj:`ChainMonitor` from listening to active. It creates a new thread that runs
-        the ``notify_subscribers`` method, which is in charge of notifying the receiving queue for each block hash that
-        is added to the internal queue.
+        Changes the ``status`` of the :obj:`ChainMonitor` from listening to active. The receiving queues are notified
+        about all the ``pending_blocks`` straightaway, and about any new block hash as soon as it is enqueued from then
+        on.
 
         Raises:
             :obj:`RuntimeError`: if the ``status`` was not ``ChainMonitorStatus.LISTENING`` when the method was called.
@@ -193,14 +312,36 @@ class ChainMonitor:
             raise RuntimeError(
                 f"This method can only be called in LISTENING status. Current status is {self.status.name}."
             )
-        self.status = ChainMonitorStatus.ACTIVE
-        Thread(target=self.notify_subscribers, daemon=True).start()
+
+        with self.lock:
+            for block_hash in self.pending_blocks:
+                self.notify_subscribers(block_hash)
+
+            self.pending_blocks = []
+            self.status = ChainMonitorStatus.ACTIVE
 
     def terminate(self):
         """
         Changes the ``status`` of the :obj:`ChainMonitor` to terminated and sends the ``ChainMonitor.END_MESSAGE``
-        message to the internal queue. All the threads will stop as soon as possible.
+        message to the receiving queues. All the threads will stop as soon as possible: the liveness thread and the zmq
+        thread are woken up straightaway, while the polling thread stops once its ongoing long poll returns (at most
+        ``long_poll_timeout`` seconds later), since requests to ``bitcoind`` cannot be interrupted.
         """
 
-        self.status = ChainMonitorStatus.TERMINATED
-        self.queue.put(ChainMonitor.END_MESSAGE)
+        with self.lock:
+            self.status = ChainMonitorStatus.TERMINATED
+            self._terminated = True
+            self.pending_blocks = []
+            self.notify_subscribers(ChainMonitor.END_MESSAGE)
+
+        # Wake up the polling and liveness threads if they are waiting on check_tip
+        self.check_tip.set()
+
+        # Wake up the zmq thread so it does not wait for the poll to time out. If the sockets are not created yet, the
+        # thread will see the status before polling
+        if self.zmqInterruptSendSocket is not None:
+            try:
+                self.zmqInterruptSendSocket.send(b"", zmq.NOBLOCK)
+            except zmq.Again:
+                # The thread has already been interrupted and not consumed the previous message, nothing to do
+                pass
@@ -14,12 +14,12 @@ from common.exceptions import InvalidParameter
 
 from teos import DEFAULT_CONF, DATA_DIR, CONF_FILE_NAME
 from teos.cli.help import (
-    show_usage,
-    help_get_all_appointments,
-    help_get_tower_info,
-    help_get_users,
-    help_get_user,
-    help_stop,
+    USAGE,
+    HELP_GET_ALL_APPOINTMENTS,
+    HELP_GET_TOWER_INFO,
+    HELP_GET_USERS,
+    HELP_GET_USER,
+    HELP_STOP,
 )
 from teos.protobuf.tower_services_pb2_grpc import TowerServicesStub
 from teos.protobuf.user_pb2 import GetUserRequest
@@ -110,7 +110,37 @@ class RPCClient:
         print("Closing the Eye of Satoshi")
 
 
+# Maps every command to the RPCClient method that handles it and the number of arguments it expects
+COMMANDS = {
+    "get_all_appointments": (RPCClient.get_all_appointments, 0),
+    "get_tower_info": (RPCClient.get_tower_info, 0),
+    "get_users": (RPCClient.get_users, 0),
+    "get_user": (RPCClient.get_user, 1),
+    "stop": (RPCClient.stop, 0),
+}
+
+HELP = {
+    "get_all_appointments": HELP_GET_ALL_APPOINTMENTS,
+    "get_tower_info": HELP_GET_TOWER_INFO,
+    "get_users": HELP_GET_USERS,
+    "get_user": HELP_GET_USER,
+    "stop": HELP_STOP,
+}
+
+
 def main(command, args, data_dir, command_line_conf):
+    if command == "help":
+        if not args:
+            sys.exit(USAGE)
+        elif args[0] in HELP:
+            sys.exit(HELP[args[0]])
+        else:
+            sys.exit("Unknown command. Use help to check the list of available commands")
+
+    handler, n_args = COMMANDS[command]
+    if len(args) != n_args:
+        sys.exit(f"Expected {n_args} argument(s), not {len(args)}. Use help {command} to check the command usage")
+
     # Loads config and sets up the data folder and log file
     config_loader = ConfigLoader(data_dir, CONF_FILE_NAME, DEFAULT_CONF, command_line_conf)
     config = config_loader.build_config()
@@ -122,52 +152,8 @@ def main(command, args, data_dir, command_line_conf):
 
     rpc_client = RPCClient(teos_rpc_host, teos_rpc_port)
 
-    result = None
     try:
-        if command == "get_all_appointments":
-            result = rpc_client.get_all_appointments()
-
-        elif command == "get_tower_info":
-            result = rpc_client.get_tower_info()
-
-        elif command == "get_users":
-            result = rpc_client.get_users()
-
-        elif command == "get_user":
-            if not args:
-                sys.exit("No user_id was given")
-            if len(args) > 1:
-                sys.exit(f"Expected only one argument, not {len(args)}")
-
-            result = rpc_client.get_user(args[0])
-
-        elif command == "stop":
-            rpc_client.stop()
-
-        elif command == "help":
-            if args:
-                command = args.pop(0)
-
-                if command == "get_all_appointments":
-                    sys.exit(help_get_all_appointments())
-
-                elif command == "get_tower_info":
-                    sys.exit(help_get_tower_info())
-
-                elif command == "get_users":
-                    sys.exit(help_get_users())
-
-                elif command == "get_user":
-                    sys.exit(help_get_user())
-
-                elif command == "stop":
-                    sys.exit(help_stop())
-
-                else:
-                    sys.exit("Unknown command. Use help to check the list of available commands")
-
-            else:
-                sys.exit(show_usage())
+        result = handler(rpc_client, *args)
 
         if result:
             print(result)
@@ -185,7 +171,7 @@ def main(command, args, data_dir, command_line_conf):
 
 def run():
     command_line_conf = {}
-    commands = ["get_all_appointments", "get_appointments", "get_tower_info", "get_users", "get_user", "stop", "help"]
+    commands = list(COMMANDS) + ["help"]
 
     try:
         opts, args = getopt(argv[1:], "h", ["rpcbind=", "rpcport=", "datadir=", "help"])
@@ -208,7 +194,7 @@ def run():
                 data_dir = os.path.expanduser(arg)
 
             if opt in ["-h", "--help"]:
-                sys.exit(show_usage())
+                sys.exit(USAGE)
 
         command = args.pop(0) if args else None
         if command in commands:
@@ -1,4 +1,22 @@
 import logging.handlers
 
 SHUTDOWN_GRACE_TIME = 10  # Grace time in seconds to complete any pending call when stopping one of the services of TEOS
+KEEPALIVE_TIME_MS = 30000  # Interval between the keepalive pings of the channels to the internal API (milliseconds)
+# Options shared by all the gRPC servers of TEOS. Servers must accept the keepalive pings of the internal API channels,
+# even with no calls in flight, otherwise they reply with GOAWAY (too_many_pings) and the connection is dropped
+GRPC_SERVER_OPTIONS = [
+    ("grpc.max_concurrent_streams", 100),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.min_ping_interval_without_data_ms", KEEPALIVE_TIME_MS),
+    ("grpc.http2.max_ping_strikes", 0),
+]
+# Options for the channels connecting the proxies (API and RPC) with the internal API. Connections are kept alive even
+# if idle so the first request after a quiet period does not have to reconnect
+INTERNAL_API_CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", KEEPALIVE_TIME_MS),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.max_receive_message_length", 64 << 20),
+]
 OUTDATED_USERS_CACHE_SIZE_BLOCKS = 10  # Size of the users cache, in blocks
@@ -1,20 +1,16 @@
+import os
+import sys
 import grpc
 from concurrent import futures
 from readerwriterlock import rwlock
 from google.protobuf.struct_pb2 import Struct
 
 from teos.logger import get_logger
+from teos.constants import GRPC_SERVER_OPTIONS
 from common.appointment import Appointment, AppointmentStatus
 from common.exceptions import InvalidParameter
 
-from teos.protobuf.appointment_pb2 import (
-    Appointment as AppointmentProto,
-    Tracker as TrackerProto,
-    AppointmentData,
-    AddAppointmentResponse,
-    GetAppointmentResponse,
-    GetAllAppointmentsResponse,
-)
+from teos.protobuf.appointment_pb2 import AddAppointmentResponse, GetAppointmentResponse, GetAllAppointmentsResponse
 from teos.protobuf.user_pb2 import RegisterResponse, GetUserResponse, GetUsersResponse
 from teos.protobuf.tower_services_pb2 import GetTowerInfoResponse
 from teos.protobuf.tower_services_pb2_grpc import TowerServicesServicer, add_TowerServicesServicer_to_server
@@ -22,6 +18,84 @@ from teos.gatekeeper import NotEnoughSlots, AuthenticationFailure, SubscriptionE
 from teos.watcher import AppointmentLimitReached, AppointmentAlreadyTriggered, AppointmentNotFound
 from google.protobuf.empty_pb2 import Empty
 
+# Some read-only methods of the _InternalAPI do not take the lock since they only perform dict operations that are
+# atomic under the GIL (len, get, keys snapshots). Do not run this on a free-threaded interpreter without re-adding the
+# locks.
+assert getattr(sys, "_is_gil_enabled", lambda: True)(), "The internal API requires the GIL"
+
+# Status code and details returned for each of the exceptions that can be raised when processing a request. If the
+# details are None, the exception message is returned instead.
+ADD_APPOINTMENT_ERRORS = {
+    AuthenticationFailure: (
+        grpc.StatusCode.UNAUTHENTICATED,
+        "Invalid signature or user does not have enough slots available",
+    ),
+    NotEnoughSlots: (grpc.StatusCode.UNAUTHENTICATED, "Invalid signature or user does not have enough slots available"),
+    AppointmentLimitReached: (grpc.StatusCode.RESOURCE_EXHAUSTED, "Appointment limit reached"),
+    SubscriptionExpired: (grpc.StatusCode.UNAUTHENTICATED, None),
+    AppointmentAlreadyTriggered: (
+        grpc.StatusCode.ALREADY_EXISTS,
+        "The provided appointment has already been triggered",
+    ),
+}
+
+GET_APPOINTMENT_ERRORS = {
+    AuthenticationFailure: (grpc.StatusCode.NOT_FOUND, "Appointment not found"),
+    AppointmentNotFound: (grpc.StatusCode.NOT_FOUND, "Appointment not found"),
+    SubscriptionExpired: (grpc.StatusCode.UNAUTHENTICATED, None),
+}
+
+
+def abort_with_error(context, errors, e):
+    """
+    Aborts the current grpc call with the status code and details that correspond to the given exception.
+
+    Args:
+        context (:obj:`grpc.ServicerContext`): the context of the current grpc call.
+        errors (:obj:`dict`): a map of exception types to ``(status_code, details)`` tuples.
+        e (:obj:`Exception`): the exception raised while processing the call.
+
+    Raises:
+        :obj:`Exception`: always, as raised by ``context.abort``.
+    """
+
+    status_code, details = errors[type(e)]
+    context.abort(status_code, details if details is not None else str(e))
+
+
+def fill_appointment_proto(appointment, appointment_data):
+    """
+    Sets the fields of an appointment message from the data of an appointment, as stored in the database by the
+    Watcher. The message is filled in place, so it can be a field of a bigger message (no copies needed).
+
+    Args:
+        appointment (:obj:`Appointment <teos.protobuf.appointment_pb2.Appointment>`): the appointment message to be
+            filled.
+        appointment_data (:obj:`dict`): the appointment data.
+    """
+
+    # Stored appointments always have these fields, so they are accessed directly
+    appointment.locator = appointment_data["locator"]
+    appointment.encrypted_blob = appointment_data["encrypted_blob"]
+    appointment.to_self_delay = appointment_data["to_self_delay"]
+
+
+def fill_tracker_proto(tracker, tracker_data):
+    """
+    Sets the fields of a tracker message from the data of a tracker, as stored in the database by the Responder. The
+    message is filled in place, so it can be a field of a bigger message (no copies needed).
+
+    Args:
+        tracker (:obj:`Tracker <teos.protobuf.appointment_pb2.Tracker>`): the tracker message to be filled.
+        tracker_data (:obj:`dict`): the tracker data.
+    """
+
+    # Stored trackers always have these fields, so they are accessed directly
+    tracker.locator = tracker_data["locator"]
+    tracker.dispute_txid = tracker_data["dispute_txid"]
+    tracker.penalty_txid = tracker_data["penalty_txid"]
+    tracker.penalty_rawtx = tracker_data["penalty_rawtx"]
+
 
 class InternalAPI:
     """
@@ -32,7 +106,8 @@ class InternalAPI:
     Args:
         watcher (:obj:`Watcher <teos.watcher.Watcher>`): a :obj:`Watcher` instance to pass the requests to. The Watcher
             is the main backend class of the tower and can interact with the rest.
-        internal_api_endpoint (:obj:`str`): the endpoint where the internal api will be served (gRPC server).
+        internal_api_endpoint (:obj:`str`): the endpoint where the internal api will be served (gRPC server). Either
+            ``host:port`` or ``unix:path`` to serve it on a unix socket.
         max_workers (:obj:`int`): the maximum number of worker threads for the grpc server.
         stop_command_event (:obj:`multiprocessing.Event`): an event to be set when a ``stop`` command is issued.
 
@@ -47,8 +122,18 @@ class InternalAPI:
         self.watcher = watcher
         self.endpoint = internal_api_endpoint
         self.stop_command_event = stop_command_event
-        self.rpc_server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+        self.rpc_server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="teos-internal-api"),
+            options=GRPC_SERVER_OPTIONS,
+        )
         self.rpc_server.add_insecure_port(self.endpoint)
+
+        # The socket is created when the port is added. Only the tower user should be able to reach it
+        if self.endpoint.startswith("unix:"):
+            # Both unix:path and unix:///absolute_path are valid gRPC endpoints
+            socket_path = self.endpoint[len("unix:") :]  # noqa: E203
+            os.chmod(socket_path[2:] if socket_path.startswith("//") else socket_path, 0o600)
+
         add_TowerServicesServicer_to_server(_InternalAPI(watcher, stop_command_event, self.logger), self.rpc_server)
 
 
@@ -75,94 +160,59 @@ class _InternalAPI(TowerServicesServicer):
 
     def register(self, request, context):
         """Registers a user to the tower."""
-        with self.rw_lock.gen_wlock():
-            try:
+        # The lock is only held while interacting with the Watcher. Errors and responses are handled once released
+        try:
+            with self.rw_lock.gen_wlock():
                 available_slots, subscription_expiry, subscription_signature = self.watcher.register(request.user_id)
 
-                return RegisterResponse(
-                    user_id=request.user_id,
-                    available_slots=available_slots,
-                    subscription_expiry=subscription_expiry,
-                    subscription_signature=subscription_signature,
-                )
+        except InvalidParameter as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, e.msg)
 
-            except InvalidParameter as e:
-                context.set_details(e.msg)
-                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-                return RegisterResponse()
+        return RegisterResponse(
+            user_id=request.user_id,
+            available_slots=available_slots,
+            subscription_expiry=subscription_expiry,
+            subscription_signature=subscription_signature,
+        )
 
     def add_appointment(self, request, context):
         """Processes the request to add an appointment from a user."""
-        with self.rw_lock.gen_wlock():
-            try:
-                appointment = Appointment(
-                    request.appointment.locator, request.appointment.encrypted_blob, request.appointment.to_self_delay
-                )
-                return AddAppointmentResponse(**self.watcher.add_appointment(appointment, request.signature))
-
-            except (AuthenticationFailure, NotEnoughSlots):
-                msg = "Invalid signature or user does not have enough slots available"
-                status_code = grpc.StatusCode.UNAUTHENTICATED
-
-            except AppointmentLimitReached:
-                msg = "Appointment limit reached"
-                status_code = grpc.StatusCode.RESOURCE_EXHAUSTED
+        appointment = Appointment(
+            request.appointment.locator, request.appointment.encrypted_blob, request.appointment.to_self_delay
+        )
 
-            except SubscriptionExpired as e:
-                msg = str(e)
-                status_code = grpc.StatusCode.UNAUTHENTICATED
+        try:
+            with self.rw_lock.gen_wlock():
+                response_data = self.watcher.add_appointment(appointment, request.signature)
 
-            except AppointmentAlreadyTriggered:
-                msg = "The provided appointment has already been triggered"
-                status_code = grpc.StatusCode.ALREADY_EXISTS
+        except tuple(ADD_APPOINTMENT_ERRORS) as e:
+            abort_with_error(context, ADD_APPOINTMENT_ERRORS, e)
 
-            context.set_details(msg)
-            context.set_code(status_code)
-
-            return AddAppointmentResponse()
+        return AddAppointmentResponse(**response_data)
 
     def get_appointment(self, request, context):
         """Returns an appointment stored in the tower, if it exists."""
-        with self.rw_lock.gen_rlock():
-            try:
+        try:
+            with self.rw_lock.gen_rlock():
                 data, status = self.watcher.get_appointment(request.locator, request.signature)
-                if status == AppointmentStatus.BEING_WATCHED:
-                    data = AppointmentData(
-                        appointment=AppointmentProto(
-                            locator=data.get("locator"),
-                            encrypted_blob=data.get("encrypted_blob"),
-                            to_self_delay=data.get("to_self_delay"),
-                        )
-                    )
-                else:
-                    data = AppointmentData(
-                        tracker=TrackerProto(
-                            locator=data.get("locator"),
-                            dispute_txid=data.get("dispute_txid"),
-                            penalty_txid=data.get("penalty_txid"),
-                            penalty_rawtx=data.get("penalty_rawtx"),
-                        )
-                    )
-                return GetAppointmentResponse(appointment_data=data, status=status)
-
-            except (AuthenticationFailure, AppointmentNotFound):
-                msg = "Appointment not found"
-                status_code = grpc.StatusCode.NOT_FOUND
-
-            except SubscriptionExpired as e:
-                msg = str(e)
-                status_code = grpc.StatusCode.UNAUTHENTICATED
-
-            context.set_details(msg)
-            context.set_code(status_code)
-
-            return GetAppointmentResponse()
+
+        except tuple(GET_APPOINTMENT_ERRORS) as e:
+            abort_with_error(context, GET_APPOINTMENT_ERRORS, e)
+
+        # The nested messages are filled in place instead of being built and copied into the response
+        response = GetAppointmentResponse(status=status)
+        if status == AppointmentStatus.BEING_WATCHED:
+            fill_appointment_proto(response.appointment_data.appointment, data)
+        else:
+            fill_tracker_proto(response.appointment_data.tracker, data)
+        return response
 
     def get_all_appointments(self, request, context):
         """Returns all the appointments in the tower."""
-        with self.rw_lock.gen_rlock():
-            watcher_appointments = self.watcher.get_all_watcher_appointments()
-            responder_trackers = self.watcher.get_all_responder_trackers()
+        # No lock needed: the data is loaded from the database, whose reads are consistent on their own. Notice the lock
+        # would not prevent appointments being moved from the Watcher to the Responder while loading either
+        watcher_appointments = self.watcher.get_all_watcher_appointments()
+        responder_trackers = self.watcher.get_all_responder_trackers()
 
         appointments = Struct()
         appointments.update({"watcher_appointments": watcher_appointments, "responder_trackers": responder_trackers})
@@ -171,38 +221,36 @@ class _InternalAPI(TowerServicesServicer):
 
     def get_tower_info(self, request, context):
         """Returns generic information about the tower."""
-        with self.rw_lock.gen_rlock():
-            return GetTowerInfoResponse(
-                tower_id=self.watcher.tower_id,
-                n_registered_users=self.watcher.n_registered_users,
-                n_watcher_appointments=self.watcher.n_watcher_appointments,
-                n_responder_trackers=self.watcher.n_responder_trackers,
-            )
+        # No lock needed: only dict lengths are read (GIL-atomic)
+        return GetTowerInfoResponse(
+            tower_id=self.watcher.tower_id,
+            n_registered_users=self.watcher.n_registered_users,
+            n_watcher_appointments=self.watcher.n_watcher_appointments,
+            n_responder_trackers=self.watcher.n_responder_trackers,
+        )
 
     def get_users(self, request, context):
         """Returns the list of all registered user ids."""
-        with self.rw_lock.gen_rlock():
-            return GetUsersResponse(user_ids=self.watcher.get_registered_user_ids())
+        # No lock needed: the keys are copied in a single GIL-atomic operation
+        return GetUsersResponse(user_ids=self.watcher.get_registered_user_ids())
 
     def get_user(self, request, context):
         """Returns information about a user, given its user id."""
-        with self.rw_lock.gen_rlock():
-            user_info = self.watcher.get_user_info(request.user_id)
-
-            if not user_info:
-                context.set_details("User not found")
-                context.set_code(grpc.StatusCode.NOT_FOUND)
-                return GetUserResponse()
-
-            user_struct = Struct()
-            user_struct.update(
-                {
-                    "subscription_expiry": user_info.subscription_expiry,
-                    "available_slots": user_info.available_slots,
-                    "appointments": list(user_info.appointments.keys()),
-                }
-            )
-            return GetUserResponse(user=user_struct)
+        # No lock needed: the user is fetched with a dict get and its appointment keys copied in one go (GIL-atomic)
+        user_info = self.watcher.get_user_info(request.user_id)
+
+        if not user_info:
+            context.abort(grpc.StatusCode.NOT_FOUND, "User not found")
+
+        user_struct = Struct()
+        user_struct.update(
+            {
+                "subscription_expiry": user_info.subscription_expiry,
+                "available_slots": user_info.available_slots,
+                "appointments": list(user_info.appointments.keys()),
+            }
+        )
+        return GetUserResponse(user=user_struct)
 
     def stop(self, request, context):
         """Initiates a graceful shutdown of the tower."""
@@ -457,13 +457,18 @@ class Responder:
 
         receipts = []
 
+        # All the trackers to be rebroadcast are loaded from the db at once
+        trackers_data = self.db_manager.batch_load_responder_trackers(
+            [uuid for txid in txs_to_rebroadcast for uuid in self.tx_tracker_map[txid]]
+        )
+
         for txid in txs_to_rebroadcast:
             self.missed_confirmations[txid] = 0
 
             # FIXME: This would potentially grab multiple instances of the same transaction and try to send them.
             #   should we do it only once?
             for uuid in self.tx_tracker_map[txid]:
-                tracker = TransactionTracker.from_dict(self.db_manager.load_responder_tracker(uuid))
+                tracker = TransactionTracker.from_dict(trackers_data[uuid])
                 self.logger.warning(
                     "Transaction has missed many confirmations. Rebroadcasting", penalty_txid=tracker.penalty_txid
                 )
@@ -1,11 +1,10 @@
 import grpc
-import functools
 from concurrent import futures
 from signal import signal, SIGINT
 
 from teos.tools import ignore_signal
 from teos.logger import setup_logging, get_logger
-from teos.constants import SHUTDOWN_GRACE_TIME
+from teos.constants import SHUTDOWN_GRACE_TIME, GRPC_SERVER_OPTIONS, INTERNAL_API_CHANNEL_OPTIONS
 from teos.protobuf.tower_services_pb2_grpc import (
     TowerServicesStub,
     TowerServicesServicer,
@@ -22,42 +21,54 @@ class RPC:
         rpc_bind (:obj:`str`): the IP or host where the RPC server will be hosted.
         rpc_port (:obj:`int`): the port where the RPC server will be hosted.
         internal_api_endpoint (:obj:`str`): the endpoint where to reach the internal (gRPC) api.
+        max_workers (:obj:`int`): the maximum number of worker threads for the grpc server.
 
     Attributes:
         logger (:obj:`Logger <teos.logger.Logger>`): The logger for this component.
         endpoint (:obj:`str`): The endpoint where the RPC api will be served (external gRPC server).
         rpc_server (:obj:`grpc.Server <grpc.Server>`): The non-started gRPC server instance.
+        servicer (:obj:`_RPC`): The servicer forwarding the requests to the internal api.
     """
 
-    def __init__(self, rpc_bind, rpc_port, internal_api_endpoint):
+    def __init__(self, rpc_bind, rpc_port, internal_api_endpoint, max_workers):
         self.logger = get_logger(component=RPC.__name__)
         self.endpoint = f"{rpc_bind}:{rpc_port}"
-        self.rpc_server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+        self.rpc_server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="teos-rpc"),
+            options=GRPC_SERVER_OPTIONS,
+        )
         self.rpc_server.add_insecure_port(self.endpoint)
-        add_TowerServicesServicer_to_server(_RPC(internal_api_endpoint, self.logger), self.rpc_server)
+        self.servicer = _RPC(internal_api_endpoint, self.logger)
+        add_TowerServicesServicer_to_server(self.servicer, self.rpc_server)
 
     def teardown(self):
         self.logger.info("Stopping")
         stopped_event = self.rpc_server.stop(SHUTDOWN_GRACE_TIME)
         stopped_event.wait()
+        self.servicer.channel_ready.cancel()
+        self.servicer.channel.close()
         self.logger.info("Stopped")
 
 
-def forward_errors(func):
+def forward_to(stub_method):
     """
-    Transforms ``func`` in order to forward any ``grpc.RPCError`` returned by the upstream grpc as the result of the
-    current grpc call.
+    Builds a grpc method handler that forwards the request to the given ``stub_method`` of the upstream grpc, and
+    forwards any ``grpc.RPCError`` returned by it as the result of the current grpc call.
+
+    Args:
+        stub_method (:obj:`callable`): the method of the upstream stub the requests are forwarded to.
+
+    Returns:
+        :obj:`function`: The handler, taking the ``request`` and ``context`` of the call.
     """
 
-    @functools.wraps(func)
-    def wrapper(self, request, context, *args, **kwargs):
+    def forward(request, context):
         try:
-            return func(self, request, context, *args, **kwargs)
+            return stub_method(request)
         except grpc.RpcError as e:
-            context.set_details(e.details())
-            context.set_code(e.code())
+            context.abort(e.code(), e.details())
 
-    return wrapper
+    return forward
 
 
 class _RPC(TowerServicesServicer):
@@ -69,37 +80,29 @@ class _RPC(TowerServicesServicer):
         logger (:obj:`Logger <teos.logger.Logger>`): the logger for this component.
 
     Attributes:
+        channel (:obj:`grpc.Channel`): The channel to the internal api, shared by all the calls.
+        channel_ready (:obj:`grpc.Future`): A future that resolves once the channel is connected.
         stub (:obj:`TowerServicesStub`): The rpc client stub.
     """
 
+    # The methods offered to the CLI. The rest of the TowerServices (e.g. add_appointment) are not exposed by the RPC
+    FORWARDED_METHODS = ["get_all_appointments", "get_tower_info", "get_users", "get_user", "stop"]
+
     def __init__(self, internal_api_endpoint, logger):
         self.logger = logger
         self.internal_api_endpoint = internal_api_endpoint
-        channel = grpc.insecure_channel(self.internal_api_endpoint)
-        self.stub = TowerServicesStub(channel)
-
-    @forward_errors
-    def get_all_appointments(self, request, context):
-        return self.stub.get_all_appointments(request)
-
-    @forward_errors
-    def get_tower_info(self, request, context):
-        return self.stub.get_tower_info(request)
+        self.channel = grpc.insecure_channel(self.internal_api_endpoint, options=INTERNAL_API_CHANNEL_OPTIONS)
+        # Start connecting straightaway so the first call does not pay for the connection setup. This is not waited for,
+        # since the internal api is started after the rpc (and the channel keeps retrying until it is up)
+        self.channel_ready = grpc.channel_ready_future(self.channel)
+        self.stub = TowerServicesStub(self.channel)
 
-    @forward_errors
-    def get_users(self, request, context):
-        return self.stub.get_users(request)
+        # All the methods are forwarded as they are, so the handlers are bound to the stub methods once
+        for method_name in _RPC.FORWARDED_METHODS:
+            setattr(self, method_name, forward_to(getattr(self.stub, method_name)))
 
-    @forward_errors
-    def get_user(self, request, context):
-        return self.stub.get_user(request)
 
-    @forward_errors
-    def stop(self, request, context):
-        return self.stub.stop(request)
-
-
-def serve(rpc_bind, rpc_port, internal_api_endpoint, logging_port, stop_event):
+def serve(rpc_bind, rpc_port, internal_api_endpoint, max_workers, logging_port, stop_event):
     """
     Serves the external RPC API at the given endpoint and connects it to the internal api.
 
@@ -109,22 +112,22 @@ def serve(rpc_bind, rpc_port, internal_api_endpoint, logging_port, stop_event):
         rpc_bind (:obj:`str`): the IP or host where the RPC server will be hosted.
         rpc_port (:obj:`int`): the port where the RPC server will be hosted.
         internal_api_endpoint (:obj:`str`): the endpoint where to reach the internal (gRPC) api.
+        max_workers (:obj:`int`): the maximum number of worker threads for the grpc server.
         logging_port (:obj:`int`): the port where the logging server can be reached (localhost:logging_port)
         stop_event (:obj:`multiprocessing.Event`) the Event that this service will monitor. The rpc server will
             initiate a graceful shutdown once this event is set.
     """
 
-    setup_logging(logging_port)
-    rpc = RPC(rpc_bind, rpc_port, internal_api_endpoint)
-    # Ignores SIGINT so the main process can handle the teardown
+    # Ignores SIGINT so the main process can handle the teardown. This is done before anything else so a Ctrl-C sent to
+    # the whole process group while the server is being set up does not kill it either
     signal(SIGINT, ignore_signal)
+
+    setup_logging(logging_port)
+    rpc = RPC(rpc_bind, rpc_port, internal_api_endpoint, max_workers)
     rpc.rpc_server.start()
 
     rpc.logger.info(f"Initialized. Serving at {rpc.endpoint}")
 
     stop_event.wait()
 
-    rpc.logger.info("Stopping")
-    stopped_event = rpc.rpc_server.stop(SHUTDOWN_GRACE_TIME)
-    stopped_event.wait()
-    rpc.logger.info("Stopped")
+    rpc.teardown()
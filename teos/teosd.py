@@ -1,9 +1,10 @@
 import os
+import sys
 import daemon
-import subprocess
 from sys import argv, exit
 import multiprocessing
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from getopt import getopt, GetoptError
 from signal import signal, SIGINT, SIGQUIT, SIGTERM
@@ -32,6 +33,21 @@ from teos.constants import SHUTDOWN_GRACE_TIME
 
 parent_pid = os.getpid()
 
+# Command line options that directly set a config field, alongside the field and the type of its value
+COMMAND_LINE_OPTIONS = {
+    "--apibind": ("API_BIND", str),
+    "--apiport": ("API_PORT", int),
+    "--rpcbind": ("RPC_BIND", str),
+    "--rpcport": ("RPC_PORT", int),
+    "--btcnetwork": ("BTC_NETWORK", str),
+    "--btcrpcuser": ("BTC_RPC_USER", str),
+    "--btcrpcpassword": ("BTC_RPC_PASSWORD", str),
+    "--btcrpcconnect": ("BTC_RPC_CONNECT", str),
+    "--btcrpcport": ("BTC_RPC_PORT", int),
+    "--btcfeedconnect": ("BTC_FEED_CONNECT", str),
+    "--btcfeedport": ("BTC_FEED_PORT", int),
+}
+
 
 def get_config(command_line_conf, data_dir):
     """
@@ -80,9 +96,8 @@ class TeosDaemon:
         chain_monitor (:obj:`teos.chain_monitor.ChainMonitor`): The ``ChainMonitor`` instance.
         internal_api_endpoint (:obj:`str`): The full host name and port of the internal api.
         internal_api (:obj:`teos.internal_api.InternalAPI`): The InternalAPI instance.
-        api_proc (:obj:`subprocess.Popen` or :obj:`multiprocessing.Process`): Once the rpc process
-            is created, the instance of either ``Popen`` or ``Process`` that is serving the public API (set to
-            :obj:`None` beforehand).
+        api_proc (:obj:`multiprocessing.Process`): Once the rpc process is created, the process that is serving the
+            public API, either with gunicorn or waitress (set to :obj:`None` beforehand).
         rpc_process (:obj:`multiprocessing.Process`): The instance of the internal RPC server; only set if running.
     """
 
@@ -100,8 +115,13 @@ class TeosDaemon:
         # event triggered when the public API is halted, hence teosd is ready to stop
         self.stop_event = multiprocessing.Event()
 
-        bitcoind_connect_params = {k: v for k, v in config.items() if k.startswith("BTC_RPC")}
-        bitcoind_feed_params = {k: v for k, v in config.items() if k.startswith("BTC_FEED")}
+        # Splits the bitcoind params in a single pass over the config
+        bitcoind_connect_params, bitcoind_feed_params = {}, {}
+        for k, v in config.items():
+            if k.startswith("BTC_RPC"):
+                bitcoind_connect_params[k] = v
+            elif k.startswith("BTC_FEED"):
+                bitcoind_feed_params[k] = v
 
         if not can_connect_to_bitcoind(bitcoind_connect_params):
             raise RuntimeError("Cannot connect to bitcoind")
@@ -109,7 +129,6 @@ class TeosDaemon:
         elif not in_correct_network(bitcoind_connect_params, config.get("BTC_NETWORK")):
             raise RuntimeError("bitcoind is running on a different network, check teos.conf and bitcoin.conf")
 
-        self.logger.info("tower_id = {}".format(Cryptographer.get_compressed_pk(sk.public_key)))
         self.block_processor = BlockProcessor(bitcoind_connect_params)
         carrier = Carrier(bitcoind_connect_params)
 
@@ -131,6 +150,7 @@ class TeosDaemon:
             self.config.get("MAX_APPOINTMENTS"),
             self.config.get("LOCATOR_CACHE_SIZE"),
         )
+        self.logger.info("tower_id = {}".format(self.watcher.tower_id))
 
         self.watcher_thread = None
         self.responder_thread = None
@@ -142,8 +162,14 @@ class TeosDaemon:
             bitcoind_feed_params,
         )
 
-        # Set up the internal API
-        self.internal_api_endpoint = f'{self.config.get("INTERNAL_API_HOST")}:{self.config.get("INTERNAL_API_PORT")}'
+        # Set up the internal API. It can be served on a unix socket (e.g. INTERNAL_API_HOST=unix:/path/to/socket), in
+        # which case the port is ignored
+        if self.config.get("INTERNAL_API_HOST").startswith("unix:"):
+            self.internal_api_endpoint = self.config.get("INTERNAL_API_HOST")
+        else:
+            self.internal_api_endpoint = (
+                f'{self.config.get("INTERNAL_API_HOST")}:{self.config.get("INTERNAL_API_PORT")}'
+            )
         self.internal_api = InternalAPI(
             self.watcher, self.internal_api_endpoint, self.config.get("INTERNAL_API_WORKERS"), self.stop_command_event
         )
@@ -155,6 +181,7 @@ class TeosDaemon:
                 self.config.get("RPC_BIND"),
                 self.config.get("RPC_PORT"),
                 self.internal_api_endpoint,
+                self.config.get("RPC_WORKERS"),
                 self.logging_port,
                 self.stop_event,
             ),
@@ -165,6 +192,28 @@ class TeosDaemon:
         # It will be an instance of either Popen or Process, depending on the WSGI config setting.
         self.api_proc = None
 
+    def get_missed_data(self, last_known_block):
+        """
+        Gets the data missed by a component since ``last_known_block``, accounting for any reorg that may have happened
+        while the tower was offline.
+
+        Args:
+            last_known_block (:obj:`str`): the hash of the last block known by the component.
+
+        Returns:
+            :obj:`tuple`: A tuple (:obj:`list`, :obj:`list`) containing the transactions dropped by the reorg (if any)
+            and the hashes of the missed blocks, starting from the child of the last common ancestor.
+        """
+
+        # After a clean shutdown the last known block is usually still the tip, so there is nothing to walk
+        if last_known_block == self.block_processor.get_best_block_hash():
+            return [], []
+
+        last_common_ancestor, dropped_txs = self.block_processor.find_last_common_ancestor(last_known_block)
+        missed_blocks = self.block_processor.get_missed_blocks(last_common_ancestor)
+
+        return dropped_txs, missed_blocks
+
     def bootstrap_components(self):
         """
         Performs the initial setup of the components. It loads the appointments and tracker for the watcher and the
@@ -175,8 +224,12 @@ class TeosDaemon:
         # Make sure that the ChainMonitor starts listening to new blocks while we bootstrap
         self.chain_monitor.monitor_chain()
 
-        watcher_appointments_data = self.db_manager.load_watcher_appointments()
-        responder_trackers_data = self.db_manager.load_responder_trackers()
+        # The Watcher and Responder data are independent, so both db scans are run at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            watcher_appointments_future = executor.submit(self.db_manager.load_watcher_appointments)
+            responder_trackers_future = executor.submit(self.db_manager.load_responder_trackers)
+            watcher_appointments_data = watcher_appointments_future.result()
+            responder_trackers_data = responder_trackers_future.result()
 
         if len(watcher_appointments_data) == 0 and len(responder_trackers_data) == 0:
             self.logger.info("Fresh bootstrap")
@@ -207,23 +260,21 @@ class TeosDaemon:
             last_block_responder = self.db_manager.load_last_block_hash_responder()
 
             # Populate the block queues with data if they've missed some while offline. If the blocks of both match
-            # we don't perform the search twice.
+            # we don't perform the search twice. Otherwise, both searches are run at the same time (they only wait on
+            # bitcoind).
 
             # FIXME: 32-reorgs-offline dropped txs are not used at this point.
-            last_common_ancestor_watcher, dropped_txs_watcher = self.block_processor.find_last_common_ancestor(
-                last_block_watcher
-            )
-            missed_blocks_watcher = self.block_processor.get_missed_blocks(last_common_ancestor_watcher)
-
             if last_block_watcher == last_block_responder:
+                dropped_txs_watcher, missed_blocks_watcher = self.get_missed_data(last_block_watcher)
                 dropped_txs_responder = dropped_txs_watcher
                 missed_blocks_responder = missed_blocks_watcher
 
             else:
-                last_common_ancestor_responder, dropped_txs_responder = self.block_processor.find_last_common_ancestor(
-                    last_block_responder
-                )
-                missed_blocks_responder = self.block_processor.get_missed_blocks(last_common_ancestor_responder)
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    watcher_missed_data_future = executor.submit(self.get_missed_data, last_block_watcher)
+                    responder_missed_data_future = executor.submit(self.get_missed_data, last_block_responder)
+                    dropped_txs_watcher, missed_blocks_watcher = watcher_missed_data_future.result()
+                    dropped_txs_responder, missed_blocks_responder = responder_missed_data_future.result()
 
             # If only one of the instances needs to be updated, it can be done separately.
             if len(missed_blocks_watcher) == 0 and len(missed_blocks_responder) != 0:
@@ -264,29 +315,20 @@ class TeosDaemon:
 
         # Start the public API server
         api_endpoint = f"{self.config.get('API_BIND')}:{self.config.get('API_PORT')}"
+        api_params = {
+            "internal_api_endpoint": self.internal_api_endpoint,
+            "endpoint": api_endpoint,
+            "logging_port": logging_port,
+            "min_to_self_delay": self.config.get("MIN_TO_SELF_DELAY"),
+        }
+
         if self.config.get("WSGI") == "gunicorn":
             # FIXME: We may like to add workers depending on a config value
-            self.api_proc = subprocess.Popen(
-                [
-                    "gunicorn",
-                    f"--bind={api_endpoint}",
-                    f"teos.api:serve(internal_api_endpoint='{self.internal_api_endpoint}', "
-                    f"endpoint='{api_endpoint}', logging_port='{logging_port}', "
-                    f"min_to_self_delay='{self.config.get('MIN_TO_SELF_DELAY')}')",
-                ]
-            )
+            self.api_proc = multiprocessing.Process(target=api.serve_gunicorn, kwargs=api_params)
         else:
-            self.api_proc = multiprocessing.Process(
-                target=api.serve,
-                kwargs={
-                    "internal_api_endpoint": self.internal_api_endpoint,
-                    "endpoint": api_endpoint,
-                    "logging_port": logging_port,
-                    "min_to_self_delay": self.config.get("MIN_TO_SELF_DELAY"),
-                    "auto_run": True,
-                },
-            )
-            self.api_proc.start()
+            self.api_proc = multiprocessing.Process(target=api.serve, kwargs={**api_params, "auto_run": True})
+
+        self.api_proc.start()
 
     def handle_signals(self, signum, frame):
         """Handles signals by initiating a graceful shutdown."""
@@ -299,12 +341,13 @@ class TeosDaemon:
         self.logger.info("Terminating public API")
 
         # Stop the public API first
-        if isinstance(self.api_proc, subprocess.Popen):
-            self.api_proc.terminate()
-            self.api_proc.wait()
-        elif isinstance(self.api_proc, multiprocessing.Process):
-            # FIXME: using SIGKILL for now, adapt it to use SIGTERM so the shutdown can be grateful
-            self.api_proc.kill()
+        if self.api_proc is not None:
+            if self.config.get("WSGI") == "gunicorn":
+                # gunicorn shuts down its workers gracefully on SIGTERM
+                self.api_proc.terminate()
+            else:
+                # FIXME: using SIGKILL for now, adapt it to use SIGTERM so the shutdown can be grateful
+                self.api_proc.kill()
             self.api_proc.join()
 
         self.logger.info("Public API terminated")
@@ -387,82 +430,43 @@ def main(config):
 
 def run():
     # Subprocess need to be run using "spawn" for consistent execution between different OS. No state is really shared
-    # between process.
-    multiprocessing.set_start_method("spawn")
+    # between process. On Linux "forkserver" is used instead: children are forked from a clean server process, so no
+    # state is shared either, but the modules they run are only imported once (by the server) instead of per child.
+    if sys.platform == "linux":
+        multiprocessing.set_start_method("forkserver")
+        multiprocessing.set_forkserver_preload(["teos.logger", "teos.rpc", "teos.api"])
+    else:
+        multiprocessing.set_start_method("spawn")
 
     command_line_conf = {}
     data_dir = DATA_DIR
 
-    opts, _ = getopt(
-        argv[1:],
-        "hd",
-        [
-            "apibind=",
-            "apiport=",
-            "rpcbind=",
-            "rpcport=",
-            "btcnetwork=",
-            "btcrpcuser=",
-            "btcrpcpassword=",
-            "btcrpcconnect=",
-            "btcrpcport=",
-            "btcfeedconnect=",
-            "btcfeedport=",
-            "datadir=",
-            "wsgi=",
-            "daemon",
-            "overwritekey",
-            "help",
-        ],
-    )
     try:
+        opts, _ = getopt(
+            argv[1:],
+            "hd",
+            [f"{opt[2:]}=" for opt in COMMAND_LINE_OPTIONS] + ["datadir=", "wsgi=", "daemon", "overwritekey", "help"],
+        )
+
         for opt, arg in opts:
-            if opt in ["--apibind"]:
-                command_line_conf["API_BIND"] = arg
-            if opt in ["--apiport"]:
-                try:
-                    command_line_conf["API_PORT"] = int(arg)
-                except ValueError:
-                    exit("apiport must be an integer")
-            if opt in ["--rpcbind"]:
-                command_line_conf["RPC_BIND"] = arg
-            if opt in ["--rpcport"]:
-                try:
-                    command_line_conf["RPC_PORT"] = int(arg)
-                except ValueError:
-                    exit("rpcport must be an integer")
-            if opt in ["--btcnetwork"]:
-                command_line_conf["BTC_NETWORK"] = arg
-            if opt in ["--btcrpcuser"]:
-                command_line_conf["BTC_RPC_USER"] = arg
-            if opt in ["--btcrpcpassword"]:
-                command_line_conf["BTC_RPC_PASSWORD"] = arg
-            if opt in ["--btcrpcconnect"]:
-                command_line_conf["BTC_RPC_CONNECT"] = arg
-            if opt in ["--btcrpcport"]:
-                try:
-                    command_line_conf["BTC_RPC_PORT"] = int(arg)
-                except ValueError:
-                    exit("btcrpcport must be an integer")
-            if opt in ["--btcfeedconnect"]:
-                command_line_conf["BTC_FEED_CONNECT"] = arg
-            if opt in ["--btcfeedport"]:
+            if opt in COMMAND_LINE_OPTIONS:
+                field, field_type = COMMAND_LINE_OPTIONS[opt]
                 try:
-                    command_line_conf["BTC_FEED_PORT"] = int(arg)
+                    command_line_conf[field] = field_type(arg)
                 except ValueError:
-                    exit("btcfeedport must be an integer")
-            if opt in ["--datadir"]:
+                    exit(f"{opt[2:]} must be an integer")
+            elif opt == "--datadir":
                 data_dir = os.path.expanduser(arg)
-            if opt in ["--wsgi"]:
+            elif opt == "--wsgi":
                 if arg in ["gunicorn", "waitress"]:
                     command_line_conf["WSGI"] = arg
                 else:
                     exit("wsgi must be either gunicorn or waitress")
-            if opt in ["-d", "--daemon"]:
+            elif opt in ["-d", "--daemon"]:
                 command_line_conf["DAEMON"] = True
-            if opt in ["--overwritekey"]:
+            elif opt == "--overwritekey":
                 command_line_conf["OVERWRITE_KEY"] = True
-            if opt in ["-h", "--help"]:
+            elif opt in ["-h", "--help"]:
                 exit(show_usage())
 
     except GetoptError as e:
@@ -1,7 +1,8 @@
 from socket import timeout
+from threading import local
 from http.client import HTTPException
 
-from teos.utils.auth_proxy import AuthServiceProxy, JSONRPCException
+from teos.utils.auth_proxy import AuthServiceProxy, JSONRPCException, HTTP_TIMEOUT
 
 from common.constants import MAINNET_RPC_PORT, TESTNET_RPC_PORT, REGTEST_RPC_PORT
 
@@ -11,13 +12,14 @@ Tools is a module with general methods that can used by different entities in th
 
 
 # NOTCOVERED
-def bitcoin_cli(btc_connect_params):
+def bitcoin_cli(btc_connect_params, timeout=HTTP_TIMEOUT):
     """
     An ``http`` connection with ``bitcoind`` using the ``json-rpc`` interface.
 
     Args:
         btc_connect_params (:obj:`dict`): a dictionary with the parameters to connect to bitcoind
             (``rpc user, rpc password, host and port``)
+        timeout (:obj:`int`): the time (in seconds) to wait for ``bitcoind`` to reply before giving up.
 
     Returns:
         :obj:`AuthServiceProxy <teos.utils.auth_proxy.AuthServiceProxy>`: An authenticated service proxy to ``bitcoind``
@@ -31,10 +33,37 @@ def bitcoin_cli(btc_connect_params):
             btc_connect_params.get("BTC_RPC_PASSWORD"),
             btc_connect_params.get("BTC_RPC_CONNECT"),
             btc_connect_params.get("BTC_RPC_PORT"),
-        )
+        ),
+        timeout=timeout,
     )
 
 
+class ThreadLocalBitcoinCli(local):
+    """
+    Keeps an ``http`` connection with ``bitcoind`` per thread, so it is reused by all the ``json-rpc`` commands sent
+    from a thread instead of opening a new connection per command. Connections are not shared between threads since
+    ``http.client`` connections are not thread safe.
+
+    Commands are sent the same way as with :func:`bitcoin_cli`, e.g.
+    ``ThreadLocalBitcoinCli(btc_connect_params).getblockcount()``.
+
+    Args:
+        btc_connect_params (:obj:`dict`): a dictionary with the parameters to connect to bitcoind
+            (``rpc user, rpc password, host and port``)
+
+    Attributes:
+        proxy (:obj:`AuthServiceProxy <teos.utils.auth_proxy.AuthServiceProxy>`): the service proxy of the current
+            thread.
+    """
+
+    def __init__(self, btc_connect_params):
+        # local runs __init__ again, with the same arguments, the first time the object is used from every other thread
+        self.proxy = bitcoin_cli(btc_connect_params)
+
+    def __getattr__(self, name):
+        return getattr(self.proxy, name)
+
+
 # NOTCOVERED
 def can_connect_to_bitcoind(btc_connect_params):
     """
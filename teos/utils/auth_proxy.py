@@ -111,21 +111,29 @@ class AuthServiceProxy:
             # TODO: Find out why the connection would disconnect occasionally and make it reusable on Windows
             self._set_conn()
         try:
-            self.__conn.request(method, path, postdata, headers)
-            return self._get_response()
-        except http.client.BadStatusLine as e:
-            if e.line == "''":  # if connection was closed, try again
+            try:
+                self.__conn.request(method, path, postdata, headers)
+                return self._get_response()
+            except http.client.BadStatusLine as e:
+                # if connection was closed, try again. This also covers RemoteDisconnected, raised when the server
+                # closes an idle keep-alive connection (e.g. bitcoind's rpcservertimeout)
+                if e.line == "''":
+                    self.__conn.close()
+                    self.__conn.request(method, path, postdata, headers)
+                    return self._get_response()
+                else:
+                    raise
+            except (BrokenPipeError, ConnectionResetError):
+                # Python 3.5+ raises BrokenPipeError instead of BadStatusLine when the connection was reset
+                # ConnectionResetError happens on FreeBSD with Python 3.4
                 self.__conn.close()
                 self.__conn.request(method, path, postdata, headers)
                 return self._get_response()
-            else:
-                raise
-        except (BrokenPipeError, ConnectionResetError):
-            # Python 3.5+ raises BrokenPipeError instead of BadStatusLine when the connection was reset
-            # ConnectionResetError happens on FreeBSD with Python 3.4
+        except Exception:
+            # A failed request may leave the connection half way through a request/response cycle. Close it so the
+            # connection can be reused by later calls (it is reopened on the next request)
             self.__conn.close()
-            self.__conn.request(method, path, postdata, headers)
-            return self._get_response()
+            raise
 
     def get_request(self, *args, **argsn):
         AuthServiceProxy.__id_count += 1
@@ -226,13 +226,15 @@ class Watcher:
         self.responder = responder
         self.max_appointments = max_appointments
         self.signing_key = sk
+        # The key is fixed for the lifetime of the tower, so the id only needs to be computed once
+        self._tower_id = Cryptographer.get_compressed_pk(sk.public_key)
         self.last_known_block = db_manager.load_last_block_hash_watcher()
         self.locator_cache = LocatorCache(blocks_in_cache)
 
     @property
     def tower_id(self):
         """Get the id of this tower, as a hex string."""
-        return Cryptographer.get_compressed_pk(self.signing_key.public_key)
+        return self._tower_id
 
     @property
     def n_registered_users(self):
@@ -632,9 +634,14 @@ class Watcher:
         # A cache of the already decrypted blobs so replicate decryption can be avoided
         decrypted_blobs = {}
 
+        # All the breached appointments are loaded from the db at once
+        appointments_data = self.db_manager.batch_load_watcher_appointments(
+            [uuid for locator in breaches for uuid in self.locator_uuid_map[locator]]
+        )
+
         for locator, dispute_txid in breaches.items():
             for uuid in self.locator_uuid_map[locator]:
-                appointment = ExtendedAppointment.from_dict(self.db_manager.load_watcher_appointment(uuid))
+                appointment = ExtendedAppointment.from_dict(appointments_data[uuid])
 
                 if appointment.encrypted_blob in decrypted_blobs:
                     penalty_txid, penalty_rawtx = decrypted_blobs[appointment.encrypted_blob]
@@ -1,4 +1,5 @@
 import pytest
+import socket
 from shutil import rmtree
 from coincurve import PrivateKey
 
@@ -60,6 +61,16 @@ def block_processor(run_bitcoind):
     return BlockProcessor(bitcoind_connect_params)
 
 
+@pytest.fixture(scope="module")
+def unreachable_block_processor():
+    # A BlockProcessor pointing to a port where nothing is listening, so every connection to bitcoind is refused
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        port = s.getsockname()[1]
+
+    return BlockProcessor({**bitcoind_connect_params, "BTC_RPC_CONNECT": "localhost", "BTC_RPC_PORT": port})
+
+
 @pytest.fixture(scope="module")
 def gatekeeper(user_db_manager, block_processor):
     return Gatekeeper(
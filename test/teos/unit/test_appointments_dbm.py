@@ -65,6 +65,19 @@ def test_load_appointments_db(db_manager):
     assert set(values) == set(local_appointments.values()) and (len(values) == len(local_appointments))
 
 
+def test_load_appointments_db_exclude(db_manager):
+    prefix = "YY"
+    keys = [get_random_value_hex(16) for _ in range(10)]
+    for key in keys:
+        db_manager.db.put((prefix + key).encode("utf-8"), json.dumps({"value": key}).encode("utf-8"))
+
+    # Excluded entries are left out of the loaded data
+    excluded = set(keys[:3])
+    db_appointments = db_manager.load_appointments_db(prefix, exclude=excluded)
+
+    assert set(db_appointments.keys()) == set(keys[3:])
+
+
 def test_get_last_known_block():
     db_path = "empty_db"
 
@@ -222,6 +235,18 @@ def test_store_load_watcher_appointment(db_manager, watcher_appointments):
         assert appointment.to_dict() == db_watcher_appointments[uuid]
 
 
+def test_batch_load_watcher_appointments(db_manager, watcher_appointments):
+    for uuid, appointment in watcher_appointments.items():
+        db_manager.store_watcher_appointment(uuid, appointment.to_dict())
+
+    # Unknown uuids are returned as None
+    unknown_uuid = uuid4().hex
+    db_watcher_appointments = db_manager.batch_load_watcher_appointments(list(watcher_appointments) + [unknown_uuid])
+
+    assert db_watcher_appointments.pop(unknown_uuid) is None
+    assert db_watcher_appointments == {uuid: appt.to_dict() for uuid, appt in watcher_appointments.items()}
+
+
 def test_store_load_triggered_appointment(generate_dummy_appointment, db_manager):
     db_watcher_appointments = db_manager.load_watcher_appointments()
     db_watcher_appointments_with_triggered = db_manager.load_watcher_appointments(include_triggered=True)
@@ -265,6 +290,18 @@ def test_store_load_responder_trackers(db_manager, responder_trackers):
     assert set(responder_trackers.values()) == set(values) and len(responder_trackers) == len(values)
 
 
+def test_batch_load_responder_trackers(db_manager, responder_trackers):
+    for key, value in responder_trackers.items():
+        db_manager.store_responder_tracker(key, {"value": value})
+
+    # Unknown uuids are returned as None
+    unknown_uuid = uuid4().hex
+    db_responder_trackers = db_manager.batch_load_responder_trackers(list(responder_trackers) + [unknown_uuid])
+
+    assert db_responder_trackers.pop(unknown_uuid) is None
+    assert db_responder_trackers == {key: {"value": value} for key, value in responder_trackers.items()}
+
+
 def test_delete_watcher_appointment(db_manager, watcher_appointments):
     # make sure that some appointments were added
     # (needed in case the test is ran individually rather than as part of the suite)
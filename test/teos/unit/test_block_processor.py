@@ -1,4 +1,5 @@
 import pytest
+import teos.block_processor
 from teos.watcher import InvalidTransactionFormat
 from test.teos.conftest import generate_blocks
 from test.teos.unit.conftest import get_random_value_hex, fork
@@ -41,6 +42,35 @@ def test_get_block_count(block_processor):
     assert isinstance(block_count, int) and block_count >= 0
 
 
+def test_wait_for_new_block(block_processor):
+    # If no block is mined the call times out returning the current tip
+    best_block_hash = block_processor.get_best_block_hash()
+    tip = block_processor.wait_for_new_block(0.1)
+    assert tip.get("hash") == best_block_hash
+
+    # Otherwise the new tip is returned
+    new_block_hash = generate_blocks(1)[0]
+    tip = block_processor.wait_for_new_block(0.1)
+    assert tip.get("hash") == new_block_hash
+
+
+def test_wait_for_new_block_reuses_connection(block_processor):
+    # Consecutive long polls from the same thread are sent over the same connection
+    block_processor.wait_for_new_block(0.1)
+    proxy = block_processor._long_poll_rpc.proxy
+    block_processor.wait_for_new_block(0.1)
+    assert block_processor._long_poll_rpc.proxy is proxy
+
+    # Unless a longer poll is requested, which needs a longer connection timeout
+    block_processor.wait_for_new_block(1)
+    assert block_processor._long_poll_rpc.proxy is not proxy
+
+
+def test_wait_for_new_block_bitcoind_unreachable(unreachable_block_processor):
+    # Connection errors are handled and reported as None, like JSON-RPC errors
+    assert unreachable_block_processor.wait_for_new_block(0.1) is None
+
+
 def test_decode_raw_transaction(block_processor):
     # We cannot exhaustively test this (we rely on bitcoind for this) but we can try to decode a correct transaction
     assert block_processor.decode_raw_transaction(hex_tx) is not None
@@ -69,6 +99,20 @@ def test_get_missed_blocks(block_processor):
     assert block_processor.get_missed_blocks(block_tip) == missed_blocks[1:]
 
 
+def test_get_block_hashes(block_processor, monkeypatch):
+    # Use a small batch size so the request is split
+    monkeypatch.setattr(teos.block_processor, "MAX_RPC_BATCH_SIZE", 2)
+
+    block_count = block_processor.get_block_count()
+    new_blocks = generate_blocks(5)
+
+    assert block_processor.get_block_hashes(range(block_count + 1, block_count + 6)) == new_blocks
+    assert block_processor.get_block_hashes(range(0)) == []
+
+    # Heights that are not in the chain cannot be fetched
+    assert block_processor.get_block_hashes(range(block_count + 1, block_count + 10)) is None
+
+
 def test_get_distance_to_tip(block_processor):
     target_distance = 5
 
@@ -1,8 +1,9 @@
 import zmq
 import time
 from queue import Queue
-from threading import Thread, Event, Condition
+from threading import Thread, Event, Lock
 import pytest
+from collections import deque
 
 from teos.chain_monitor import ChainMonitor, ChainMonitorStatus
 
@@ -17,11 +18,13 @@ def test_init(block_processor):
     chain_monitor = ChainMonitor([Queue(), Queue()], block_processor, bitcoind_feed_params)
 
     assert chain_monitor.status == ChainMonitorStatus.IDLE
-    assert isinstance(chain_monitor.last_tips, list) and len(chain_monitor.last_tips) == 0
+    assert isinstance(chain_monitor.last_tips, deque) and len(chain_monitor.last_tips) == 0
     assert chain_monitor.status == ChainMonitorStatus.IDLE
+    assert chain_monitor._terminated is False
     assert isinstance(chain_monitor.check_tip, Event)
-    assert isinstance(chain_monitor.lock, Condition)
-    assert isinstance(chain_monitor.zmqSubSocket, zmq.Socket)
+    assert isinstance(chain_monitor.lock, type(Lock()))
+    # The zmq sockets are not created until the zmq thread is started
+    assert chain_monitor.zmqContext is None and chain_monitor.zmqSubSocket is None
 
     assert isinstance(chain_monitor.receiving_queues[0], Queue)
     assert isinstance(chain_monitor.receiving_queues[1], Queue)
@@ -38,37 +41,36 @@ def test_notify_subscribers(block_processor):
 
     block1 = get_random_value_hex(32)
     block2 = get_random_value_hex(32)
-    block3 = get_random_value_hex(32)
-
-    # we add two elements to the internal queue before the thread is started
-    chain_monitor.queue.put(block1)
-    chain_monitor.queue.put(block2)
-
-    assert queue1.qsize() == 0
-    assert queue2.qsize() == 0
 
-    notifying_thread = Thread(target=chain_monitor.notify_subscribers, daemon=True)
-    notifying_thread.start()
+    chain_monitor.notify_subscribers(block1)
+    chain_monitor.notify_subscribers(block2)
 
-    # the existing elements should be processed soon and in order for all queues
+    # All the queues should have been notified, in order
     for q in [queue1, queue2]:
         assert q.get(timeout=0.1) == block1
         assert q.get(timeout=0.1) == block2
+        assert q.empty()
 
-    # Subscribers are only notified as long as they are awake
-    chain_monitor.queue.put(block3)
 
-    assert queue1.get(timeout=0.1) == block3
-    assert queue2.get(timeout=0.1) == block3
+def test_enqueue_not_active(block_processor):
+    # Blocks enqueued before the ChainMonitor is active are kept in pending_blocks, and not notified
+    queue = Queue()
+    chain_monitor = ChainMonitor([queue], block_processor, bitcoind_feed_params)
+    block_hashes = [get_random_value_hex(32) for _ in range(3)]
 
-    chain_monitor.terminate()
+    for block_hash in block_hashes:
+        chain_monitor.enqueue(block_hash)
+
+    assert chain_monitor.pending_blocks == block_hashes
+    assert queue.empty()
 
 
 def test_enqueue(block_processor):
     # The state is updated after receiving a new block (and only if the block is not already known).
     # Let's start by adding some hashes to last_tips
     chain_monitor = ChainMonitor([Queue(), Queue()], block_processor, bitcoind_feed_params)
-    chain_monitor.last_tips = [get_random_value_hex(32) for _ in range(5)]
+    for _ in range(5):
+        chain_monitor._add_tip(get_random_value_hex(32))
 
     # Now we can try to update the state with an hash already seen and see how it doesn't work
     assert chain_monitor.enqueue(chain_monitor.last_tips[0]) is False
@@ -79,10 +81,24 @@ def test_enqueue(block_processor):
     assert chain_monitor.last_tips[-1] == another_block_hash
 
 
+def test_enqueue_window_bounded(block_processor):
+    # last_tips is a sliding window, so the oldest tips are evicted (and forgotten) once it is full
+    chain_monitor = ChainMonitor([Queue(), Queue()], block_processor, bitcoind_feed_params)
+    block_hashes = [get_random_value_hex(32) for _ in range(chain_monitor.max_block_window_size + 1)]
+
+    for block_hash in block_hashes:
+        assert chain_monitor.enqueue(block_hash) is True
+
+    assert list(chain_monitor.last_tips) == block_hashes[1:]
+    assert block_hashes[0] not in chain_monitor._last_tips_set
+    assert chain_monitor.enqueue(block_hashes[0]) is True
+
+
 def test_monitor_chain_polling(block_processor):
     chain_monitor = ChainMonitor([Queue(), Queue()], block_processor, bitcoind_feed_params)
-    chain_monitor.last_tips = [block_processor.get_best_block_hash()]
+    chain_monitor._add_tip(block_processor.get_best_block_hash())
     chain_monitor.polling_delta = 0.1
+    chain_monitor.status = ChainMonitorStatus.ACTIVE  # mock the status so blocks are notified straightaway
 
     # monitor_chain_polling runs until not terminated
     polling_thread = Thread(target=chain_monitor.monitor_chain_polling, daemon=True)
@@ -90,43 +106,124 @@ def test_monitor_chain_polling(block_processor):
 
     # Check that nothing changes as long as a block is not generated
     for _ in range(5):
-        assert chain_monitor.queue.empty()
+        assert chain_monitor.receiving_queues[0].empty()
         time.sleep(0.1)
 
     # And that it does if we generate a block
     generate_blocks(1)
 
-    chain_monitor.queue.get()
-    assert chain_monitor.queue.empty()
+    chain_monitor.receiving_queues[0].get(timeout=1)
+    assert chain_monitor.receiving_queues[0].empty()
 
     chain_monitor.terminate()
 
 
+def test_monitor_chain_polling_bitcoind_unreachable(unreachable_block_processor, monkeypatch):
+    # If bitcoind cannot be reached, the polling thread should survive and back off for polling_delta before retrying
+    chain_monitor = ChainMonitor([Queue(), Queue()], unreachable_block_processor, bitcoind_feed_params)
+    chain_monitor.polling_delta = 0.5
+
+    poll_calls = []
+    wait_for_new_block = unreachable_block_processor.wait_for_new_block
+
+    def counted_wait_for_new_block(timeout):
+        poll_calls.append(timeout)
+        return wait_for_new_block(timeout)
+
+    monkeypatch.setattr(unreachable_block_processor, "wait_for_new_block", counted_wait_for_new_block)
+
+    polling_thread = Thread(target=chain_monitor.monitor_chain_polling, daemon=True)
+    polling_thread.start()
+    time.sleep(1.2)
+
+    # The thread is still alive, and only polled once per polling_delta (every refused connection returns right away)
+    assert polling_thread.is_alive()
+    assert 2 <= len(poll_calls) <= 3
+
+    chain_monitor.terminate()
+    polling_thread.join(1)
+    assert not polling_thread.is_alive()
+
+
 def test_monitor_chain_zmq(block_processor):
     responder_queue = Queue()
     chain_monitor = ChainMonitor([Queue(), responder_queue], block_processor, bitcoind_feed_params)
-    chain_monitor.last_tips = [block_processor.get_best_block_hash()]
+    chain_monitor._add_tip(block_processor.get_best_block_hash())
+    chain_monitor.status = ChainMonitorStatus.ACTIVE  # mock the status so blocks are notified straightaway
 
     zmq_thread = Thread(target=chain_monitor.monitor_chain_zmq, daemon=True)
     zmq_thread.start()
 
-    # the internal queue should start empty
-    assert chain_monitor.queue.empty()
+    # the receiving queue should start empty
+    assert responder_queue.empty()
 
     # And have a new block every time we generate one
     for _ in range(3):
         generate_blocks(1)
 
-        chain_monitor.queue.get()
-        assert chain_monitor.queue.empty()
+        responder_queue.get(timeout=1)
+        assert responder_queue.empty()
 
     chain_monitor.terminate()
-    # The zmq thread needs a block generation to release from the recv method.
-    generate_blocks(1)
+
+
+def test_monitor_chain_zmq_burst(block_processor):
+    queue = Queue()
+    chain_monitor = ChainMonitor([queue], block_processor, bitcoind_feed_params)
+    chain_monitor._add_tip(block_processor.get_best_block_hash())
+    chain_monitor.status = ChainMonitorStatus.ACTIVE  # mock the status so blocks are notified straightaway
+
+    zmq_thread = Thread(target=chain_monitor.monitor_chain_zmq, daemon=True)
+    zmq_thread.start()
+
+    # All the blocks of a burst should be notified, in order
+    block_hashes = generate_blocks(3)
+    assert [queue.get(timeout=1) for _ in range(3)] == block_hashes
+    assert queue.empty()
+
+    chain_monitor.terminate()
+    zmq_thread.join(1)
+
+
+def test_monitor_chain_liveness(block_processor):
+    queue = Queue()
+    chain_monitor = ChainMonitor([queue], block_processor, bitcoind_feed_params)
+    chain_monitor._add_tip(block_processor.get_best_block_hash())
+    chain_monitor.liveness_interval = 0.1
+    chain_monitor.status = ChainMonitorStatus.ACTIVE  # mock the status so blocks are notified straightaway
+
+    liveness_thread = Thread(target=chain_monitor.monitor_chain_liveness, daemon=True)
+    liveness_thread.start()
+
+    # Nothing is notified if the chain does not grow
+    time.sleep(0.3)
+    assert queue.empty()
+
+    # If a block is mined (and missed by the other threads, which are not running), it is picked by the liveness check
+    block_hash = generate_blocks(1)[0]
+    assert queue.get(timeout=1) == block_hash
+
+    chain_monitor.terminate()
+
+
+@pytest.mark.timeout(5)
+def test_monitor_chain_zmq_terminate(block_processor):
+    # Terminating the ChainMonitor should release the zmq thread without waiting for a new block (or the poll timeout)
+    chain_monitor = ChainMonitor([Queue(), Queue()], block_processor, bitcoind_feed_params)
+    chain_monitor.zmq_poll_timeout = 60000
+
+    zmq_thread = Thread(target=chain_monitor.monitor_chain_zmq, daemon=True)
+    zmq_thread.start()
+
+    chain_monitor.terminate()
+    zmq_thread.join()
+
+    # The sockets are created by the zmq thread, even if the monitor is terminated before it starts polling
+    assert isinstance(chain_monitor.zmqSubSocket, zmq.Socket)
 
 
 def test_monitor_chain(block_processor):
-    # We don't activate it but we start listening; therefore received blocks should accumulate in the internal queue
+    # We don't activate it but we start listening; therefore received blocks should accumulate in pending_blocks
     chain_monitor = ChainMonitor([Queue(), Queue()], block_processor, bitcoind_feed_params)
     chain_monitor.polling_delta = 0.1
 
@@ -136,7 +233,7 @@ def test_monitor_chain(block_processor):
     # The tip is updated before starting the threads, so it should have been added to last_tips.
     assert len(chain_monitor.last_tips) > 0
 
-    # Blocks should be received and added to the queue
+    # Blocks should be received and added to pending_blocks
     count = 0
     for _ in range(5):
         generate_blocks(1)
@@ -144,11 +241,9 @@ def test_monitor_chain(block_processor):
         time.sleep(0.11)  # higher than the polling interval
         assert chain_monitor.receiving_queues[0].empty()
         assert chain_monitor.receiving_queues[1].empty()
-        assert chain_monitor.queue.qsize() == count
+        assert len(chain_monitor.pending_blocks) == count
 
     chain_monitor.terminate()
-    # The zmq thread needs a block generation to release from the recv method.
-    generate_blocks(1)
 
 
 def test_monitor_chain_wrong_status_raises(block_processor):
@@ -182,8 +277,6 @@ def test_activate(block_processor):
         assert chain_monitor.receiving_queues[1].empty()
 
     chain_monitor.terminate()
-    # The zmq thread needs a block generation to release from the recv method.
-    generate_blocks(1)
 
 
 def test_activate_wrong_status_raises(block_processor):
@@ -226,8 +319,6 @@ def test_monitor_chain_single_update(block_processor):
     assert chain_monitor.enqueue(queue0_block) is False
 
     chain_monitor.terminate()
-    # The zmq thread needs a block generation to release from the recv method.
-    generate_blocks(1)
 
 
 def test_monitor_chain_and_activate(block_processor):
@@ -243,8 +334,8 @@ def test_monitor_chain_and_activate(block_processor):
         queue1.put(block)
         queue2.put(block)
 
-    # We don't activate the ChainMonitor but we start listening; therefore received blocks should accumulate in the
-    # internal queue
+    # We don't activate the ChainMonitor but we start listening; therefore received blocks should accumulate in
+    # pending_blocks
     chain_monitor = ChainMonitor([queue1, queue2], block_processor, bitcoind_feed_params)
     chain_monitor.polling_delta = 0.1
 
@@ -268,8 +359,6 @@ def test_monitor_chain_and_activate(block_processor):
         assert queue2.get(timeout=0.1) == block
 
     chain_monitor.terminate()
-    # The zmq thread needs a block generation to release from the recv method.
-    generate_blocks(1)
 
 
 def test_terminate(block_processor):
@@ -283,6 +372,7 @@ def test_terminate(block_processor):
     chain_monitor.terminate()
 
     assert chain_monitor.status == ChainMonitorStatus.TERMINATED
+    assert chain_monitor._terminated is True
 
     # generate a new block
     generate_blocks(1)
@@ -304,4 +394,31 @@ def test_threads_stop_when_terminated(block_processor):
     # If any of the function does not exit immediately, the test will timeout
     chain_monitor.monitor_chain_polling()
     chain_monitor.monitor_chain_zmq()
-    chain_monitor.notify_subscribers()
+    chain_monitor.monitor_chain_liveness()
+
+
+def test_terminate_wakes_up_waiting_threads(block_processor):
+    # Threads waiting on check_tip should not have to wait for the timeout to notice the monitor was terminated
+    chain_monitor = ChainMonitor([Queue(), Queue()], block_processor, bitcoind_feed_params)
+    chain_monitor._add_tip(block_processor.get_best_block_hash())
+
+    liveness_thread = Thread(target=chain_monitor.monitor_chain_liveness, daemon=True)
+    liveness_thread.start()
+
+    chain_monitor.terminate()
+    liveness_thread.join(1)
+    assert not liveness_thread.is_alive()
+
+
+def test_terminate_stops_polling_thread(block_processor):
+    # The polling thread cannot be interrupted while long polling, but it should stop once the ongoing poll returns
+    chain_monitor = ChainMonitor([Queue(), Queue()], block_processor, bitcoind_feed_params)
+    chain_monitor.long_poll_timeout = 1
+
+    polling_thread = Thread(target=chain_monitor.monitor_chain_polling, daemon=True)
+    polling_thread.start()
+    time.sleep(0.1)  # Make sure the thread is already long polling
+
+    chain_monitor.terminate()
+    polling_thread.join(chain_monitor.long_poll_timeout + 1)
+    assert not polling_thread.is_alive()
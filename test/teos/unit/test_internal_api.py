@@ -1,3 +1,6 @@
+import os
+import stat
+import time
 from multiprocessing import Event
 import grpc
 import pytest
@@ -12,6 +15,7 @@ from teos.watcher import Watcher
 from teos.responder import Responder
 from teos.gatekeeper import UserInfo
 from teos.internal_api import InternalAPI
+from teos.constants import GRPC_SERVER_OPTIONS, INTERNAL_API_CHANNEL_OPTIONS, KEEPALIVE_TIME_MS
 from teos.protobuf.tower_services_pb2_grpc import TowerServicesStub
 from teos.protobuf.tower_services_pb2 import GetTowerInfoResponse
 from teos.protobuf.user_pb2 import RegisterRequest, RegisterResponse, GetUsersResponse, GetUserRequest, GetUserResponse
@@ -51,6 +55,60 @@ def internal_api(db_manager, gatekeeper, carrier, block_processor):
     i_api.rpc_server.stop(None)
 
 
+def test_internal_api_unix_socket(internal_api, tmp_path):
+    socket_path = os.path.join(tmp_path, "internal_api.sock")
+    i_api = InternalAPI(internal_api.watcher, f"unix:{socket_path}", config.get("INTERNAL_API_WORKERS"), Event())
+    i_api.rpc_server.start()
+
+    # The socket is only accessible by the owner
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+    # And the api can be reached through it
+    unix_stub = TowerServicesStub(grpc.insecure_channel(f"unix:{socket_path}"))
+    assert isinstance(unix_stub.get_users(Empty()), GetUsersResponse)
+
+    i_api.rpc_server.stop(None)
+
+
+def shorten_keepalive(options, interval_ms):
+    # Replaces the keepalive intervals so the test does not need to idle for minutes. Every other option is kept
+    intervals = ["grpc.keepalive_time_ms", "grpc.http2.min_ping_interval_without_data_ms"]
+    return [(k, interval_ms if k in intervals else v) for k, v in options]
+
+
+@pytest.mark.timeout(30)
+def test_internal_api_idle_channel_keepalive(internal_api, tmp_path, monkeypatch):
+    # The server must accept the pings sent by the channels at the configured interval
+    server_options, channel_options = dict(GRPC_SERVER_OPTIONS), dict(INTERNAL_API_CHANNEL_OPTIONS)
+    assert channel_options.get("grpc.keepalive_time_ms") == KEEPALIVE_TIME_MS
+    assert server_options.get("grpc.http2.min_ping_interval_without_data_ms") <= KEEPALIVE_TIME_MS
+    assert server_options.get("grpc.keepalive_permit_without_calls") == 1
+
+    interval_ms = 500
+    monkeypatch.setattr("teos.internal_api.GRPC_SERVER_OPTIONS", shorten_keepalive(GRPC_SERVER_OPTIONS, interval_ms))
+    endpoint = f"unix:{os.path.join(tmp_path, 'keepalive.sock')}"
+    i_api = InternalAPI(internal_api.watcher, endpoint, config.get("INTERNAL_API_WORKERS"), Event())
+    i_api.rpc_server.start()
+
+    channel = grpc.insecure_channel(endpoint, options=shorten_keepalive(INTERNAL_API_CHANNEL_OPTIONS, interval_ms))
+    states = []
+    channel.subscribe(states.append, try_to_connect=True)
+    stub = TowerServicesStub(channel)
+    assert isinstance(stub.get_users(Empty()), GetUsersResponse)
+
+    # Keep the channel idle for several keepalive periods. The connection must not be dropped in the meantime
+    time.sleep(10 * interval_ms / 1000)
+    assert states[-1] == grpc.ChannelConnectivity.READY
+    assert grpc.ChannelConnectivity.TRANSIENT_FAILURE not in states
+    assert states.count(grpc.ChannelConnectivity.READY) == 1
+
+    # And the channel is still usable
+    assert isinstance(stub.get_users(Empty()), GetUsersResponse)
+
+    channel.close()
+    i_api.rpc_server.stop(None)
+
+
 @pytest.fixture()
 def clear_state(internal_api, db_manager):
     """If added to a test, it will clear the db and all the appointments in the watcher and responder before running
@@ -1,6 +1,7 @@
 import pytest
+from threading import Thread
 
-from teos.tools import in_correct_network, get_default_rpc_port
+from teos.tools import in_correct_network, get_default_rpc_port, ThreadLocalBitcoinCli
 from test.teos.unit.conftest import bitcoind_connect_params
 
 from common.constants import MAINNET_RPC_PORT, TESTNET_RPC_PORT, REGTEST_RPC_PORT
@@ -26,3 +27,21 @@ def test_get_default_rpc_port_wrong():
     for v in values:
         with pytest.raises(ValueError):
             get_default_rpc_port(v)
+
+
+def test_thread_local_bitcoin_cli(run_bitcoind):
+    rpc = ThreadLocalBitcoinCli(bitcoind_connect_params)
+
+    # The same proxy (and therefore connection) is reused by every call from the same thread
+    proxy = rpc.proxy
+    assert isinstance(rpc.getblockcount(), int)
+    assert isinstance(rpc.getblockcount(), int)
+    assert rpc.proxy is proxy
+
+    # While every other thread gets its own
+    other_proxies = []
+    thread = Thread(target=lambda: other_proxies.append(rpc.proxy))
+    thread.start()
+    thread.join()
+
+    assert other_proxies[0] is not proxy
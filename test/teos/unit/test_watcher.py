@@ -316,6 +316,7 @@ def test_watcher_init(watcher):
     assert isinstance(watcher.responder, Responder)
     assert isinstance(watcher.max_appointments, int)
     assert isinstance(watcher.signing_key, PrivateKey)
+    assert watcher.tower_id == Cryptographer.get_compressed_pk(watcher.signing_key.public_key)
     assert isinstance(watcher.locator_cache, LocatorCache)
 
 